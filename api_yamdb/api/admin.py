@@ -1,7 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from .models import Categories, Comments, Genres, Reviews, Titles, User
+from .models import (
+    Categories, Comments, Genres, Mails, Reviews, Titles, User
+)
 
 
 @admin.register(User)
@@ -75,9 +77,18 @@ class GenresAdmin(admin.ModelAdmin):
 
 @admin.register(Titles)
 class TitlesAdmin(admin.ModelAdmin):
-    list_display = ('name', 'year', 'description', 'category')
+    list_display = ('name', 'year', 'description', 'category', 'rating')
     list_display_links = ('name',)
     list_filter = ('category', 'genre')
     search_fields = ('name',)
     ordering = ('name',)
     empty_value_display = '--нет--'
+
+
+@admin.register(Mails)
+class MailsAdmin(admin.ModelAdmin):
+    list_display = ('recipient', 'subject', 'created', 'attempts',
+                    'next_attempt', 'last_error')
+    list_filter = ('attempts',)
+    search_fields = ('recipient',)
+    ordering = ('next_attempt',)
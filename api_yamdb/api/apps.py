@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .authentication import check_claims_cache
+        from .search import ensure_search_index
+        from .sqlite import apply_pragmas
+
+        post_migrate.connect(ensure_search_index, sender=self)
+        connection_created.connect(apply_pragmas)
+        check_claims_cache()
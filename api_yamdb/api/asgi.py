@@ -0,0 +1,130 @@
+import asyncio
+import io
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+
+CATALOG_READ_PATHS = re.compile(
+    r'^/api/v1/(?:'
+    r'categories/|'
+    r'genres/|'
+    r'titles/(?:\d+/)?|'
+    r'titles/\d+/reviews/|'
+    r'titles/\d+/reviews/\d+/comments/'
+    r')$'
+)
+READ_METHODS = ('GET', 'HEAD')
+
+
+def build_environ(scope, body):
+    """Translate an ASGI HTTP scope into a WSGI environ."""
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode().decode('latin-1'),
+        'PATH_INFO': scope['path'].encode().decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': f'HTTP/{scope.get("http_version", "1.1")}',
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1').lower()
+        value = value.decode('latin-1')
+        if name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        elif name == 'content-type':
+            key = 'CONTENT_TYPE'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        if key in environ:
+            value = f'{environ[key]},{value}'
+        environ[key] = value
+    return environ
+
+
+class CatalogReadApplication:
+    """
+    ASGI application serving the read-only catalog endpoints (titles,
+    categories, genres, review and comment lists) from a dedicated pool
+    of `CATALOG_READ_THREADS` threads. A pool thread only runs the
+    Django request handling and is released before the response is sent,
+    so slow clients wait on the event loop instead of holding a thread.
+    All other requests go to the wrapped application.
+    """
+
+    def __init__(self, application, max_workers=None):
+        self.application = application
+        self.handler = WSGIHandler()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or settings.CATALOG_READ_THREADS,
+            thread_name_prefix='catalog-read',
+        )
+
+    async def __call__(self, scope, receive, send):
+        if (scope['type'] != 'http'
+                or scope['method'] not in READ_METHODS
+                or not CATALOG_READ_PATHS.match(scope['path'])):
+            return await self.application(scope, receive, send)
+
+        body = await self.read_body(receive)
+        loop = asyncio.get_running_loop()
+        status, headers, content = await loop.run_in_executor(
+            self.executor, self.get_response, build_environ(scope, body)
+        )
+
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': headers,
+        })
+        await send({
+            'type': 'http.response.body',
+            'body': b'' if scope['method'] == 'HEAD' else content,
+        })
+
+    @staticmethod
+    async def read_body(receive):
+        body = b''
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            body += message.get('body', b'')
+            if not message.get('more_body', False):
+                break
+        return body
+
+    def get_response(self, environ):
+        """Run the request through Django and collect the whole response."""
+        started = []
+
+        def start_response(status, headers, exc_info=None):
+            started[:] = [status, headers]
+
+        response = self.handler(environ, start_response)
+        try:
+            content = b''.join(response)
+        finally:
+            response.close()
+
+        status, headers = started
+        return (
+            int(status.split(' ', 1)[0]),
+            [(name.lower().encode('latin-1'), value.encode('latin-1'))
+             for name, value in headers],
+            content,
+        )
@@ -0,0 +1,211 @@
+import threading
+import time
+from collections import OrderedDict
+
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import gettext_lazy as _
+
+from .models import User
+from .replicas import route_user, use_primary
+
+SHARED_USER_KEY = 'auth-user:{pk}'
+CLAIMS_CHANGED_KEY = 'auth-claims-changed:{pk}'
+# Backends whose entries are not seen by the other worker processes.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+class UserCache:
+    """
+    Bounded LRU cache of user rows with a time to live, optionally backed
+    by the default Django cache shared between processes. Rows are kept
+    as field values, so every hit builds a separate `User` instance.
+    """
+
+    def __init__(self, max_size, timeout, shared=False):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.shared = shared
+        self.users = OrderedDict()
+        self.lock = threading.Lock()
+        self.field_names = [field.attname
+                            for field in User._meta.concrete_fields]
+
+    def get(self, pk):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.users.get(pk)
+            if entry is not None and entry[1] > now:
+                self.users.move_to_end(pk)
+                return self.load(entry[0])
+            self.users.pop(pk, None)
+
+        if self.shared:
+            values = cache.get(SHARED_USER_KEY.format(pk=pk))
+            if values is not None:
+                self.remember(pk, values)
+                return self.load(values)
+        return None
+
+    def set(self, user):
+        values = tuple(getattr(user, name) for name in self.field_names)
+        self.remember(user.pk, values)
+        if self.shared:
+            cache.set(SHARED_USER_KEY.format(pk=user.pk), values,
+                      self.timeout)
+
+    def remember(self, pk, values):
+        with self.lock:
+            self.users[pk] = (values, time.monotonic() + self.timeout)
+            self.users.move_to_end(pk)
+            while len(self.users) > self.max_size:
+                self.users.popitem(last=False)
+
+    def load(self, values):
+        return User.from_db('default', self.field_names, values)
+
+    def invalidate(self, pk):
+        with self.lock:
+            self.users.pop(pk, None)
+        if self.shared:
+            cache.delete(SHARED_USER_KEY.format(pk=pk))
+
+    def clear(self):
+        with self.lock:
+            self.users.clear()
+
+
+user_cache = UserCache(
+    max_size=settings.AUTH_USER_CACHE_SIZE,
+    timeout=settings.AUTH_USER_CACHE_TIMEOUT,
+    shared=settings.AUTH_USER_CACHE_SHARED,
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that takes the user from `user_cache` and only
+    reads the primary database on a miss. Saving or deleting a user
+    invalidates its entry in this process and in the shared layer; other
+    processes see the change after `AUTH_USER_CACHE_TIMEOUT` at the
+    latest.
+    """
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            route_user(result[0].pk)
+        return result
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+
+        user = user_cache.get(user_id)
+        if user is None:
+            # Raises for missing and inactive users, which are not cached.
+            with use_primary():
+                user = super().get_user(validated_token)
+            user_cache.set(user)
+        return user
+
+
+def issue_token(user):
+    """
+    Access token of `user`. With `AUTH_CLAIMS_TOKENS` it also carries
+    the role and username checked by the permissions.
+    """
+    token = AccessToken.for_user(user)
+    if settings.AUTH_CLAIMS_TOKENS:
+        token['iat'] = time.time()
+        token['role'] = user.role
+        token['username'] = user.username
+    return token
+
+
+def revoke_claims(pk):
+    """
+    Stop trusting the claims of the tokens issued to user `pk` so far.
+    Claims are only trusted for `AUTH_CLAIMS_LIFETIME`, so the mark does
+    not need to live longer.
+    """
+    timeout = settings.AUTH_CLAIMS_LIFETIME.total_seconds()
+    cache.set(CLAIMS_CHANGED_KEY.format(pk=pk), time.time(), timeout)
+
+
+def check_claims_cache():
+    """
+    Refuse claims tokens without a default cache shared by the workers:
+    a revocation written by one worker would not reach the others, and a
+    demoted admin would keep admin access there for AUTH_CLAIMS_LIFETIME.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if settings.AUTH_CLAIMS_TOKENS and backend in PROCESS_LOCAL_CACHES:
+        raise ImproperlyConfigured(
+            'AUTH_CLAIMS_TOKENS требует кэш, общий для всех процессов: '
+            f'{backend} хранит отзыв токенов в памяти одного процесса'
+        )
+
+
+class ClaimsUser(TokenUser):
+    """A user built from the claims of a token, without the database."""
+
+    @property
+    def role(self):
+        return self.token['role']
+
+
+class ClaimsJWTAuthentication(CachedJWTAuthentication):
+    """
+    Authenticates safe-method requests bearing a token with role and
+    username claims without reading the user: `request.user` is then a
+    `ClaimsUser`. The claims are trusted for `AUTH_CLAIMS_LIFETIME` after
+    the token was issued, unless the user has been changed since. Other
+    requests and tokens get the `User` as `CachedJWTAuthentication` does.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if (request.method in SAFE_METHODS
+                and self.has_trusted_claims(validated_token)):
+            user = ClaimsUser(validated_token)
+        else:
+            user = self.get_user(validated_token)
+        route_user(user.pk)
+        return user, validated_token
+
+    def has_trusted_claims(self, token):
+        claims = {'iat', 'role', api_settings.USER_ID_CLAIM}
+        if not claims <= set(token.payload):
+            return False
+        issued = token['iat']
+        lifetime = settings.AUTH_CLAIMS_LIFETIME.total_seconds()
+        if issued < time.time() - lifetime:
+            return False
+        changed = cache.get(
+            CLAIMS_CHANGED_KEY.format(pk=token[api_settings.USER_ID_CLAIM])
+        )
+        return changed is None or issued > changed
@@ -0,0 +1,33 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+from django.db import connections
+
+
+@contextmanager
+def benchmark_database(using='default'):
+    """
+    Run the block against a freshly migrated throwaway database, so that
+    benchmarks never write to the configured one. SQLite gets a file
+    database, which unlike the in-memory one is shared between threads.
+    """
+    connection = connections[using]
+    test_settings = connection.settings_dict['TEST']
+    old_test_name = test_settings.get('NAME')
+    directory = None
+    if connection.vendor == 'sqlite' and not old_test_name:
+        directory = tempfile.mkdtemp(prefix='api_yamdb-benchmark-')
+        test_settings['NAME'] = os.path.join(directory, 'db.sqlite3')
+
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings['NAME'] = old_test_name
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,104 @@
+import random
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from api.models import Categories, Comments, Genres, Reviews, Titles, User
+from api.search import normalize
+
+BATCH_SIZE = 1000
+WORDS = (
+    'Побег', 'Шоушенк', 'Крёстный', 'отец', 'Зелёная', 'миля', 'Форрест',
+    'Гамп', 'Список', 'Шиндлера', 'Властелин', 'колец', 'Матрица', 'Леон',
+    'Начало', 'Интерстеллар', 'Бойцовский', 'клуб', 'Жизнь', 'прекрасна',
+)
+ADMIN_USERNAME = 'bench-admin'
+USER_USERNAME = 'bench-user'
+
+
+def create_in_batches(model, objects):
+    objects = iter(objects)
+    batch = list(islice(objects, BATCH_SIZE))
+    while batch:
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        batch = list(islice(objects, BATCH_SIZE))
+
+
+def seed(titles=1000, reviews_per_title=10, comments_per_review=2,
+         genres=20, categories=5, random_seed=0):
+    """
+    Fill an empty database with a synthetic catalog. Returns a dict with
+    the ids and slugs the benchmark requests refer to.
+    """
+    rnd = random.Random(random_seed)
+    password = make_password(None)
+
+    create_in_batches(Categories, (
+        Categories(id=number, name=f'Категория {number}',
+                   slug=f'category-{number}')
+        for number in range(1, categories + 1)
+    ))
+    create_in_batches(Genres, (
+        Genres(id=number, name=f'Жанр {number}', slug=f'genre-{number}')
+        for number in range(1, genres + 1)
+    ))
+
+    authors = max(reviews_per_title, 1)
+    users = [
+        User(id=1, username=ADMIN_USERNAME, email='admin@bench.fake',
+             role='admin', is_staff=True, password=password),
+        User(id=2, username=USER_USERNAME, email='user@bench.fake',
+             role='user', password=password),
+    ]
+    users += [
+        User(id=number, username=f'bench-{number}',
+             email=f'bench-{number}@bench.fake', role='user',
+             password=password)
+        for number in range(3, authors + 3)
+    ]
+    create_in_batches(User, users)
+
+    names = (' '.join(rnd.sample(WORDS, 3)) for _ in range(titles))
+    create_in_batches(Titles, (
+        Titles(id=number, name=name, search_name=normalize(name),
+               year=rnd.randint(1950, 2020), description=name * 3,
+               category_id=rnd.randint(1, categories))
+        for number, name in enumerate(names, start=1)
+    ))
+
+    GenreTitle = Titles.genre.through
+    create_in_batches(GenreTitle, (
+        GenreTitle(titles_id=title, genres_id=genre)
+        for title in range(1, titles + 1)
+        for genre in rnd.sample(range(1, genres + 1), min(2, genres))
+    ))
+
+    create_in_batches(Reviews, (
+        Reviews(id=(title - 1) * reviews_per_title + number + 1,
+                title_id=title, author_id=number + 3,
+                text=f'Отзыв {number} на произведение {title}',
+                score=rnd.randint(1, 10))
+        for title in range(1, titles + 1)
+        for number in range(reviews_per_title)
+    ))
+    create_in_batches(Comments, (
+        Comments(id=(review - 1) * comments_per_review + number + 1,
+                 review_id=review, author_id=rnd.randint(3, authors + 2),
+                 text=f'Комментарий {number} к отзыву {review}')
+        for review in range(1, titles * reviews_per_title + 1)
+        for number in range(comments_per_review)
+    ))
+    Titles.objects.rebuild_ratings()
+
+    return {
+        'title_id': 1,
+        'review_id': 1 if reviews_per_title else None,
+        'comment_id': 1 if reviews_per_title and comments_per_review else None,
+        'genre': 'genre-1',
+        'category': 'category-1',
+        'username': USER_USERNAME,
+        'search': WORDS[1].lower(),
+        'year': rnd.randint(1950, 2020),
+    }
@@ -0,0 +1,250 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.servers.basehttp import ThreadedWSGIServer
+from django.test import Client, override_settings
+from django.test.testcases import QuietWSGIRequestHandler
+from django.utils.http import urlencode
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.models import User
+from api.views import SendConfirmCodeView
+
+from .dataset import ADMIN_USERNAME, USER_USERNAME
+
+# Set by api.middleware.RequestMetricsMiddleware.
+QUERY_COUNT_HEADER = 'X-Query-Count'
+
+Endpoint = namedtuple('Endpoint', ('method', 'path', 'data', 'user'))
+Sample = namedtuple('Sample', ('latency', 'status', 'queries'))
+
+
+def get_endpoints(refs):
+    """Requests covering every route of `api/urls.py`."""
+    email = User.objects.get(username=USER_USERNAME).email
+    title = f'/api/v1/titles/{refs["title_id"]}/'
+    reviews = f'{title}reviews/'
+    review = f'{reviews}{refs["review_id"]}/'
+    comments = f'{review}comments/'
+    comment = f'{comments}{refs["comment_id"]}/'
+
+    endpoints = [
+        Endpoint('post', '/api/v1/auth/email/', {'email': email}, None),
+        Endpoint('post', '/api/v1/auth/token/', {
+            'email': email,
+            'confirmation_code': SendConfirmCodeView().create_jwt(email),
+        }, None),
+        Endpoint('get', '/api/v1/users/', None, ADMIN_USERNAME),
+        Endpoint('get', f'/api/v1/users/{refs["username"]}/', None,
+                 ADMIN_USERNAME),
+        Endpoint('get', '/api/v1/users/me/', None, USER_USERNAME),
+        Endpoint('patch', '/api/v1/users/me/', {'bio': 'benchmark'},
+                 USER_USERNAME),
+        Endpoint('get', '/api/v1/categories/', None, None),
+        Endpoint('get', '/api/v1/genres/', None, None),
+        Endpoint('get', '/api/v1/titles/', None, None),
+        Endpoint('get', '/api/v1/titles/', {'genre': refs['genre']}, None),
+        Endpoint('get', '/api/v1/titles/', {'category': refs['category']},
+                 None),
+        Endpoint('get', '/api/v1/titles/', {'year': refs['year']}, None),
+        Endpoint('get', '/api/v1/titles/', {'name': refs['search']}, None),
+        Endpoint('get', title, None, None),
+    ]
+    if refs['review_id'] is not None:
+        endpoints += [
+            Endpoint('get', reviews, None, None),
+            Endpoint('get', review, None, None),
+            Endpoint('get', comments, None, None),
+        ]
+    if refs['comment_id'] is not None:
+        endpoints.append(Endpoint('get', comment, None, None))
+    return endpoints
+
+
+def get_endpoint_name(endpoint):
+    name = f'{endpoint.method.upper()} {endpoint.path}'
+    if endpoint.method == 'get' and endpoint.data:
+        params = '&'.join(f'{key}={value}'
+                          for key, value in endpoint.data.items())
+        name = f'{name}?{params}'
+    return name
+
+
+def parse_query_count(value):
+    return int(value) if value is not None else None
+
+
+def get_auth_headers():
+    headers = {}
+    for username in (ADMIN_USERNAME, USER_USERNAME):
+        token = AccessToken.for_user(User.objects.get(username=username))
+        headers[username] = {'Authorization': f'Bearer {token}'}
+    return headers
+
+
+class InProcessDriver:
+    """Sends requests through the Django test client of each thread."""
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def __call__(self, endpoint, headers):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = Client()
+
+        extra = {
+            'HTTP_' + name.upper().replace('-', '_'): value
+            for name, value in headers.items()
+        }
+        if endpoint.method == 'get':
+            kwargs = {'data': endpoint.data}
+        else:
+            kwargs = {'data': json.dumps(endpoint.data),
+                      'content_type': 'application/json'}
+
+        started = time.perf_counter()
+        response = getattr(client, endpoint.method)(
+            endpoint.path, **kwargs, **extra
+        )
+        return Sample(time.perf_counter() - started, response.status_code,
+                      parse_query_count(response.get(QUERY_COUNT_HEADER)))
+
+
+class ServerDriver:
+    """Sends HTTP requests to a local server."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def __call__(self, endpoint, headers):
+        url = self.base_url + endpoint.path
+        body = None
+        headers = dict(headers)
+        if endpoint.method == 'get':
+            if endpoint.data:
+                url = f'{url}?{urlencode(endpoint.data)}'
+        else:
+            body = json.dumps(endpoint.data).encode()
+            headers['Content-Type'] = 'application/json'
+
+        request = urllib.request.Request(
+            url, data=body, headers=headers, method=endpoint.method.upper()
+        )
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status, response_headers = response.status, response.headers
+        except urllib.error.HTTPError as error:
+            error.read()
+            status, response_headers = error.code, error.headers
+        latency = time.perf_counter() - started
+
+        queries = parse_query_count(response_headers.get(QUERY_COUNT_HEADER))
+        return Sample(latency, status, queries)
+
+
+@contextmanager
+def local_server():
+    """Serve the project over HTTP on a free local port."""
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietWSGIRequestHandler)
+    server.set_app(WSGIHandler())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield 'http://127.0.0.1:%d' % server.server_port
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def percentile(values, share):
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    index = max(0, min(len(values) - 1, round(share * len(values)) - 1))
+    return values[index]
+
+
+def summarize(samples, elapsed):
+    latencies = sorted(sample.latency * 1000 for sample in samples)
+    queries = [sample.queries for sample in samples
+               if sample.queries is not None]
+    return {
+        'requests': len(samples),
+        'statuses': dict(Counter(str(sample.status) for sample in samples)),
+        'errors': sum(1 for sample in samples if sample.status >= 400),
+        'rps': round(len(samples) / elapsed, 1) if elapsed else None,
+        'latency_ms': {
+            'mean': round(sum(latencies) / len(latencies), 3),
+            'p50': round(percentile(latencies, 0.50), 3),
+            'p95': round(percentile(latencies, 0.95), 3),
+            'p99': round(percentile(latencies, 0.99), 3),
+        },
+        'queries_per_request': (
+            round(sum(queries) / len(queries), 2) if queries else None
+        ),
+    }
+
+
+def run_endpoint(driver, endpoint, headers, requests, concurrency):
+    samples = []
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for sample in executor.map(lambda _: driver(endpoint, headers),
+                                   range(requests)):
+            samples.append(sample)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def run_benchmark(refs, requests=200, concurrency=8, server=False,
+                  throttling=False):
+    """
+    Drive every endpoint with `requests` requests from `concurrency`
+    threads, either in-process or through a local HTTP server, and
+    return the statistics of each endpoint.
+    """
+    auth_headers = defaultdict(dict, get_auth_headers())
+    endpoints = get_endpoints(refs)
+
+    with ExitStack() as stack:
+        stack.enter_context(override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'
+        ))
+        if not throttling:
+            stack.enter_context(mock.patch.object(
+                SimpleRateThrottle, 'THROTTLE_RATES',
+                defaultdict(lambda: None)
+            ))
+        if server:
+            driver = ServerDriver(stack.enter_context(local_server()))
+        else:
+            driver = InProcessDriver()
+
+        results = {}
+        for endpoint in endpoints:
+            results[get_endpoint_name(endpoint)] = run_endpoint(
+                driver, endpoint, auth_headers[endpoint.user], requests,
+                concurrency
+            )
+
+    return {
+        'config': {
+            'requests': requests,
+            'concurrency': concurrency,
+            'mode': 'server' if server else 'in-process',
+            'throttling': throttling,
+        },
+        'endpoints': results,
+    }
@@ -0,0 +1,90 @@
+import io
+import time
+from collections import OrderedDict
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Comments, Reviews, Titles
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+from api.serializers import (
+    CommentsSerializer, ReviewsSerializer, TitlesSafeMethodSerializer
+)
+
+RENDERERS = (('stdlib', JSONRenderer()), ('fast', FastJSONRenderer()))
+PARSERS = (('stdlib', JSONParser()), ('fast', FastJSONParser()))
+
+
+def paginate(results):
+    return OrderedDict((
+        ('count', len(results)),
+        ('next', 'http://testserver/api/v1/titles/?page=2'),
+        ('previous', None),
+        ('results', results),
+    ))
+
+
+def get_pages(page_size=100):
+    """List pages as the views would return them, built from the database."""
+    titles = Titles.objects.select_related('category').prefetch_related(
+        'genre'
+    ).order_by('-id')[:page_size]
+    reviews = Reviews.objects.select_related('author', 'title').order_by(
+        '-id'
+    )[:page_size]
+    comments = Comments.objects.select_related('author').order_by(
+        '-id'
+    )[:page_size]
+    return {
+        'titles': paginate(TitlesSafeMethodSerializer(titles, many=True).data),
+        'reviews': paginate(ReviewsSerializer(reviews, many=True).data),
+        'comments': paginate(CommentsSerializer(comments, many=True).data),
+    }
+
+
+def measure(function, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat
+
+
+def run_rendering_benchmark(page_size=100, repeat=200):
+    """
+    Render and parse pages of titles, reviews and comments with the stdlib
+    based DRF classes and with the orjson based ones, checking that both
+    produce the same bytes and data.
+    """
+    results = {}
+    for name, data in get_pages(page_size).items():
+        expected = JSONRenderer().render(data)
+        result = {'bytes': len(expected)}
+        for label, renderer in RENDERERS:
+            content = renderer.render(data)
+            assert content == expected, f'{label} renders {name} differently'
+            result[f'render_{label}_us'] = round(
+                measure(lambda: renderer.render(data), repeat) * 1e6, 1
+            )
+        for label, parser in PARSERS:
+            assert parser.parse(io.BytesIO(expected)) == data
+            result[f'parse_{label}_us'] = round(
+                measure(lambda: parser.parse(io.BytesIO(expected)),
+                        repeat) * 1e6, 1
+            )
+        result['render_speedup'] = round(
+            result['render_stdlib_us'] / result['render_fast_us'], 1
+        )
+        result['parse_speedup'] = round(
+            result['parse_stdlib_us'] / result['parse_fast_us'], 1
+        )
+        results[name] = result
+
+    return {
+        'config': {
+            'page_size': page_size,
+            'repeat': repeat,
+            'orjson': orjson.__version__ if orjson is not None else None,
+        },
+        'pages': results,
+    }
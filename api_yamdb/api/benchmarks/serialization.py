@@ -0,0 +1,84 @@
+import time
+
+from rest_framework.renderers import JSONRenderer
+
+from api.models import Comments, Reviews, Titles
+from api.projections import RowProjection
+from api.serializers import (
+    CommentsSerializer, ReviewsSerializer, TitlesSafeMethodSerializer
+)
+
+
+def get_lists(page_size=100):
+    """Querysets and serializers of list pages, as the views build them."""
+    return {
+        'titles': (
+            Titles.objects.select_related('category').prefetch_related(
+                'genre'
+            ).order_by('-id')[:page_size],
+            TitlesSafeMethodSerializer,
+        ),
+        'reviews': (
+            Reviews.objects.select_related('author', 'title').order_by(
+                '-id'
+            )[:page_size],
+            ReviewsSerializer,
+        ),
+        'comments': (
+            Comments.objects.select_related('author').order_by(
+                '-id'
+            )[:page_size],
+            CommentsSerializer,
+        ),
+    }
+
+
+def serialize_instances(queryset, serializer_class):
+    return serializer_class(queryset.all(), many=True).data
+
+
+def serialize_rows(queryset, serializer_class):
+    projection = RowProjection(serializer_class())
+    return projection.represent(
+        queryset.prefetch_related(None).values(*projection.columns)
+    )
+
+
+def measure(function, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat
+
+
+def run_serialization_benchmark(page_size=100, repeat=50):
+    """
+    Fetch and serialize list pages of titles, reviews and comments from
+    model instances and from `values()` rows, checking that both render
+    to the same bytes.
+    """
+    renderer = JSONRenderer()
+    results = {}
+    for name, (queryset, serializer_class) in get_lists(page_size).items():
+        expected = renderer.render(
+            serialize_instances(queryset, serializer_class)
+        )
+        content = renderer.render(serialize_rows(queryset, serializer_class))
+        assert content == expected, f'rows render {name} differently'
+
+        result = {'rows': queryset.count()}
+        for label, function in (('instances', serialize_instances),
+                                ('rows', serialize_rows)):
+            duration = measure(
+                lambda: function(queryset, serializer_class), repeat
+            )
+            result[f'{label}_ms'] = round(duration * 1000, 3)
+            result[f'{label}_per_second'] = round(result['rows'] / duration)
+        result['speedup'] = round(result['instances_ms'] / result['rows_ms'],
+                                  1)
+        results[name] = result
+
+    return {
+        'config': {'page_size': page_size, 'repeat': repeat},
+        'pages': results,
+    }
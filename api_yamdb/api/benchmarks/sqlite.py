@@ -0,0 +1,190 @@
+import itertools
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+from django.conf import settings
+from django.db import close_old_connections, connection, connections
+from django.test import override_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from .dataset import ADMIN_USERNAME
+from .http import (
+    Endpoint, InProcessDriver, get_auth_headers, percentile
+)
+
+# SQLite's own defaults and a new connection for every request, as the
+# project ran before SQLITE_PRAGMAS and CONN_MAX_AGE.
+DEFAULT_PRAGMAS = {'journal_mode': 'delete', 'synchronous': 'full'}
+
+
+def get_configurations():
+    return {
+        'default': (DEFAULT_PRAGMAS, 0),
+        'tuned': (
+            settings.SQLITE_PRAGMAS,
+            settings.DATABASES['default'].get('CONN_MAX_AGE') or 60,
+        ),
+    }
+
+
+def summarize(latencies, elapsed, errors):
+    latencies = sorted(latency * 1000 for latency in latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1),
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50), 3),
+            'p95': round(percentile(latencies, 0.95), 3),
+            'p99': round(percentile(latencies, 0.99), 3),
+        } if latencies else None,
+    }
+
+
+def run_client(driver, next_endpoint, headers, deadline):
+    """
+    Send requests until `deadline`. Every client thread stands for a
+    worker thread of a WSGI server, so old connections are closed
+    between requests the way the request handler does it.
+    """
+    latencies, errors = [], 0
+    try:
+        while time.perf_counter() < deadline:
+            endpoint = next_endpoint()
+            if endpoint is None:
+                break
+            close_old_connections()
+            try:
+                sample = driver(endpoint, headers)
+            except Exception:
+                errors += 1
+                continue
+            finally:
+                close_old_connections()
+            if sample.status >= 400:
+                errors += 1
+            else:
+                latencies.append(sample.latency)
+    finally:
+        connection.close()
+    return latencies, errors
+
+
+@contextmanager
+def database_copy(path, max_age):
+    """
+    Point new connections at a copy of the database at `path`. Leaving
+    WAL mode needs the only connection to the file, which the connections
+    other threads keep to the original one would prevent.
+    """
+    connection.ensure_connection()
+    target = sqlite3.connect(path)
+    try:
+        connection.connection.backup(target)
+    finally:
+        target.close()
+
+    connection.close()
+    with mock.patch.dict(connections.databases['default'], NAME=path,
+                         CONN_MAX_AGE=max_age):
+        try:
+            # Opening the connection applies the pragmas, switching the
+            # journal mode before the clients connect.
+            connection.ensure_connection()
+            yield
+        finally:
+            connection.close()
+
+
+def run_configuration(refs, titles, duration, readers, writers):
+    reviews = f'/api/v1/titles/{refs["title_id"]}/reviews/'
+    read = Endpoint('get', reviews, None, None)
+    lock = threading.Lock()
+
+    def next_read():
+        return read
+
+    def next_write():
+        # Every review goes to a title the admin has not reviewed yet.
+        with lock:
+            title = next(titles, None)
+        if title is None:
+            return None
+        return Endpoint('post', f'/api/v1/titles/{title}/reviews/',
+                        {'text': 'Отзыв', 'score': 5}, ADMIN_USERNAME)
+
+    admin_headers = get_auth_headers()[ADMIN_USERNAME]
+    clients = ([(next_read, {})] * readers
+               + [(next_write, admin_headers)] * writers)
+    driver = InProcessDriver()
+    started = time.perf_counter()
+    deadline = started + duration
+    with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+        futures = [
+            executor.submit(run_client, driver, next_endpoint, headers,
+                            deadline)
+            for next_endpoint, headers in clients
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    def collect(results):
+        latencies = [latency for result, _ in results for latency in result]
+        return summarize(latencies, elapsed,
+                         sum(errors for _, errors in results))
+
+    return {
+        'reads': collect(results[:readers]),
+        'writes': collect(results[readers:]),
+    }
+
+
+def run_sqlite_benchmark(refs, titles, duration=5.0, readers=4, writers=2):
+    """
+    Read a title's reviews from `readers` threads while `writers` threads
+    post reviews to other titles, once with SQLite's defaults and a
+    connection per request and once with `SQLITE_PRAGMAS` and persistent
+    connections. Both runs start from a copy of the same data. `titles`
+    is the number of titles writers can review.
+    """
+    results = {}
+    with ExitStack() as stack:
+        directory = stack.enter_context(tempfile.TemporaryDirectory(
+            prefix='api_yamdb-sqlite-'
+        ))
+        stack.enter_context(mock.patch.object(
+            SimpleRateThrottle, 'THROTTLE_RATES', defaultdict(lambda: None)
+        ))
+        for name, (pragmas, max_age) in get_configurations().items():
+            path = os.path.join(directory, f'{name}.sqlite3')
+            available = itertools.islice(
+                itertools.count(refs['title_id'] + 1), titles - 1
+            )
+            with override_settings(SQLITE_PRAGMAS=pragmas):
+                with database_copy(path, max_age):
+                    results[name] = run_configuration(
+                        refs, available, duration, readers, writers
+                    )
+
+    speedup = {}
+    for kind in ('reads', 'writes'):
+        default = results['default'][kind]['rps']
+        speedup[kind] = (round(results['tuned'][kind]['rps'] / default, 1)
+                         if default else None)
+    return {
+        'config': {
+            'duration': duration,
+            'readers': readers,
+            'writers': writers,
+            'pragmas': dict(settings.SQLITE_PRAGMAS),
+        },
+        'results': results,
+        'speedup': speedup,
+    }
@@ -0,0 +1,114 @@
+import os
+import pickle
+import sqlite3
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import ScopedRateThrottle, SimpleRateThrottle
+
+from api.throttling import (
+    NonEmployeeBurstRateThrottle, NonEmployeeScopedRateThrottle,
+    SQLiteThrottleStorage
+)
+
+SCOPE = 'benchmark'
+
+
+class CacheHistoryThrottle(ScopedRateThrottle):
+    """DRF's own algorithm: a list of timestamps in the default cache."""
+
+
+THROTTLES = (
+    ('cache-history', CacheHistoryThrottle),
+    ('fixed-window', NonEmployeeScopedRateThrottle),
+    ('gcra', NonEmployeeBurstRateThrottle),
+)
+
+
+class View:
+    throttle_scope = SCOPE
+
+
+STATE_TABLES = {
+    NonEmployeeScopedRateThrottle: 'throttle_counters',
+    NonEmployeeBurstRateThrottle: 'throttle_cells',
+}
+
+
+def get_state_size(throttle, storage):
+    """
+    Bytes stored per key, the key included. The cache keeps the pickled
+    history of the last request's key; SQLite rows are measured by the
+    payload of their table and index pages, which needs the `dbstat`
+    table of SQLite. Without it the size is unknown and None.
+    """
+    if isinstance(throttle, CacheHistoryThrottle):
+        history = throttle.cache.get(throttle.key)
+        return len(throttle.key.encode()) + len(pickle.dumps(history))
+
+    table = STATE_TABLES[type(throttle)]
+    connection = storage.get_connection()
+    try:
+        payload, = connection.execute(
+            'SELECT sum(payload) FROM dbstat WHERE name IN ('
+            " SELECT name FROM sqlite_master WHERE tbl_name = ?)",
+            (table,)
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    rows, = connection.execute(f'SELECT count(*) FROM {table}').fetchone()
+    return round(payload / rows)
+
+
+def run_throttle(throttle_class, storage, requests, keys, rate):
+    factory = APIRequestFactory()
+    view = View()
+    clients = [factory.get('/', REMOTE_ADDR=f'10.0.{n // 256}.{n % 256}')
+               for n in range(keys)]
+    for request in clients:
+        request.user = mock.Mock(is_authenticated=False)
+
+    allowed = 0
+    throttle = None
+    with mock.patch.object(throttle_class, 'storage', storage, create=True):
+        started = time.perf_counter()
+        for number in range(requests):
+            throttle = throttle_class()
+            allowed += throttle.allow_request(clients[number % keys], view)
+        elapsed = time.perf_counter() - started
+
+    return {
+        'allowed': allowed,
+        'us_per_request': round(elapsed / requests * 1e6, 2),
+        'state_bytes_per_key': get_state_size(throttle, storage),
+    }
+
+
+def run_throttle_benchmark(requests=10000, keys=10, rate='60/min'):
+    """
+    Call `allow_request` of each throttle class `requests` times spread
+    over `keys` clients with the same `rate` and compare the cost of a
+    call and the size of the state stored per key.
+    """
+    caches['default'].clear()
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, \
+            mock.patch.object(SimpleRateThrottle, 'THROTTLE_RATES',
+                              {SCOPE: rate}):
+        storage = SQLiteThrottleStorage(
+            os.path.join(directory, 'throttle.sqlite3')
+        )
+        for name, throttle_class in THROTTLES:
+            results[name] = run_throttle(
+                throttle_class, storage, requests, keys, rate
+            )
+        storage.get_connection().close()
+    caches['default'].clear()
+
+    return {
+        'config': {'requests': requests, 'keys': keys, 'rate': rate},
+        'throttles': results,
+    }
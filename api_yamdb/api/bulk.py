@@ -0,0 +1,167 @@
+from collections import Counter
+
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField
+from rest_framework.validators import UniqueValidator
+
+from django.db import connections, router, transaction
+from django.db.models import Max, prefetch_related_objects
+
+RESOLVED_SLUGS = 'resolved_slugs'
+DUPLICATE_MESSAGE = 'Значение повторяется в запросе.'
+
+
+class BatchSlugRelatedField(serializers.SlugRelatedField):
+    """
+    `SlugRelatedField` that takes the objects resolved for the whole batch
+    by `BulkListSerializer` instead of querying every slug.
+    """
+
+    def to_internal_value(self, data):
+        resolved = self.context.get(RESOLVED_SLUGS, {}).get(
+            (self.queryset.model, self.slug_field)
+        )
+        if resolved is None:
+            return super().to_internal_value(data)
+        try:
+            return resolved[str(data)]
+        except KeyError:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=str(data))
+
+
+def bulk_create(model, objs):
+    """
+    Insert `objs` with `bulk_create` and set their primary keys. SQLite
+    does not return them, but rows inserted under the write lock of one
+    transaction are numbered consecutively after the largest id.
+    """
+    connection = connections[router.db_for_write(model)]
+    if connection.features.can_return_ids_from_bulk_insert:
+        return model.objects.bulk_create(objs)
+    if connection.vendor != 'sqlite':
+        for obj in objs:
+            obj.save(force_insert=True)
+        return objs
+
+    model.objects.bulk_create(objs)
+    last = model.objects.aggregate(last=Max('pk'))['last']
+    for pk, obj in zip(range(last - len(objs) + 1, last + 1), objs):
+        obj.pk = pk
+        obj._state.adding = False
+        obj._state.db = connection.alias
+    return objs
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Validates a batch of objects with one query per related slug field
+    and per unique field, then inserts the objects and their many-to-many
+    relations with one `bulk_create` each in a single transaction.
+    Errors are reported per item, like `ListSerializer` does.
+    """
+
+    def get_slug_fields(self):
+        for name, field in self.child.fields.items():
+            if field.read_only:
+                continue
+            if isinstance(field, ManyRelatedField):
+                field = field.child_relation
+            if isinstance(field, BatchSlugRelatedField):
+                yield name, field
+
+    def pop_unique_fields(self):
+        """Unique fields whose validators are replaced by a batch check."""
+        unique_fields = []
+        for name, field in self.child.fields.items():
+            validators = [validator for validator in field.validators
+                          if isinstance(validator, UniqueValidator)]
+            if validators:
+                field.validators = [validator for validator in field.validators
+                                    if validator not in validators]
+                unique_fields.append((name, field, validators[0]))
+        return unique_fields
+
+    def resolve_slugs(self, data):
+        resolved = {}
+        for name, field in self.get_slug_fields():
+            slugs = set()
+            for item in data:
+                value = item.get(name) if isinstance(item, dict) else None
+                if isinstance(value, list):
+                    slugs.update(str(slug) for slug in value)
+                elif value is not None:
+                    slugs.add(str(value))
+            objs = field.get_queryset().filter(
+                **{f'{field.slug_field}__in': slugs}
+            )
+            resolved[(field.queryset.model, field.slug_field)] = {
+                str(getattr(obj, field.slug_field)): obj for obj in objs
+            }
+        self._context[RESOLVED_SLUGS] = resolved
+
+    def check_unique(self, unique_fields, validated, errors):
+        model = self.child.Meta.model
+        for name, field, validator in unique_fields:
+            values = {index: item[field.source]
+                      for index, item in enumerate(validated)
+                      if item is not None and field.source in item}
+            counts = Counter(values.values())
+            existing = set(model._default_manager.filter(
+                **{f'{field.source}__in': set(values.values())}
+            ).values_list(field.source, flat=True))
+            for index, value in values.items():
+                if value in existing:
+                    message = validator.message
+                elif counts[value] > 1:
+                    message = DUPLICATE_MESSAGE
+                else:
+                    continue
+                errors[index] = {**errors[index], name: [message]}
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            return super().to_internal_value(data)
+
+        self.resolve_slugs(data)
+        unique_fields = self.pop_unique_fields()
+        validated, errors = [], []
+        for item in data:
+            try:
+                validated.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                validated.append(None)
+                errors.append(exc.detail)
+
+        self.check_unique(unique_fields, validated, errors)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return validated
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        many_to_many = [field for field in model._meta.many_to_many
+                        if field.name in self.child.fields]
+
+        objs, relations = [], []
+        for item in validated_data:
+            item = dict(item)
+            relations.append({field.name: item.pop(field.name, ())
+                              for field in many_to_many})
+            objs.append(model(**item))
+
+        with transaction.atomic(using=router.db_for_write(model)):
+            bulk_create(model, objs)
+            for field in many_to_many:
+                through = field.remote_field.through
+                source = field.m2m_field_name()
+                target = field.m2m_reverse_field_name()
+                through.objects.bulk_create([
+                    through(**{f'{source}_id': obj.pk,
+                               f'{target}_id': related.pk})
+                    for obj, related_objs in zip(objs, relations)
+                    for related in related_objs[field.name]
+                ])
+        prefetch_related_objects(objs, *(field.name for field in many_to_many))
+        return objs
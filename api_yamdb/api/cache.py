@@ -0,0 +1,53 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import urlencode
+
+LIST_VERSION_KEY = 'list-version:{label}'
+LIST_PAGE_KEY = 'list-page:{label}:{version}:{digest}'
+
+
+def new_version():
+    # Time based, so a version evicted from the cache never starts over
+    # and meets pages stored under its earlier values.
+    return time.time_ns()
+
+
+def get_list_version(model):
+    key = LIST_VERSION_KEY.format(label=model._meta.label_lower)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_list_version(model):
+    key = LIST_VERSION_KEY.format(label=model._meta.label_lower)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, new_version(), None)
+
+
+def get_list_page_key(model, request):
+    params = urlencode(sorted(request.query_params.lists()), doseq=True)
+    source = f'{request.get_host()}?{params}'
+    return LIST_PAGE_KEY.format(
+        label=model._meta.label_lower,
+        version=get_list_version(model),
+        digest=hashlib.md5(source.encode()).hexdigest(),
+    )
+
+
+def get_list_page(key):
+    return cache.get(key)
+
+
+def set_list_page(key, data):
+    # `key` must be taken before the page is read: a change made since
+    # then has bumped the version, and the page is stored under the old
+    # one that nobody asks for any more.
+    cache.set(key, data, settings.LIST_CACHE_TIMEOUT)
@@ -0,0 +1,121 @@
+import csv
+from datetime import date, datetime, time
+from itertools import islice
+
+from rest_framework import serializers
+
+from .models import Comments, Reviews, Titles
+from .projections import RowProjection
+from .renderers import FastJSONRenderer
+from .serializers import TitlesSafeMethodSerializer
+
+# Rows fetched from the cursor and held in memory at a time.
+CHUNK_SIZE = 2000
+
+
+class ReviewsExportSerializer(serializers.ModelSerializer):
+    title_id = serializers.IntegerField(read_only=True)
+    author = serializers.SlugRelatedField(slug_field='username',
+                                          read_only=True)
+
+    class Meta:
+        model = Reviews
+        fields = ('id', 'title_id', 'text', 'author', 'score', 'pub_date')
+
+
+class CommentsExportSerializer(serializers.ModelSerializer):
+    review_id = serializers.IntegerField(read_only=True)
+    author = serializers.SlugRelatedField(slug_field='username',
+                                          read_only=True)
+
+    class Meta:
+        model = Comments
+        fields = ('id', 'review_id', 'text', 'author', 'pub_date')
+
+
+EXPORTS = {
+    'titles': (Titles, TitlesSafeMethodSerializer),
+    'reviews': (Reviews, ReviewsExportSerializer),
+    'comments': (Comments, CommentsExportSerializer),
+}
+
+
+def iter_chunks(projection, model, chunk_size):
+    """
+    Lists of at most `chunk_size` represented objects, read in order of
+    id through one cursor. Many-to-many fields take a query per chunk.
+    """
+    rows = model.objects.order_by('id').values(
+        *projection.columns
+    ).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield projection.represent(chunk)
+
+
+def render_ndjson(chunks, fields):
+    renderer = FastJSONRenderer()
+    for chunk in chunks:
+        yield b''.join(renderer.render(item) + b'\n' for item in chunk)
+
+
+class Echo:
+    """File-like object that returns what is written to it."""
+
+    def write(self, value):
+        return value
+
+
+# Formats of the API for dates and times that reach the CSV unrepresented.
+TEMPORAL_FIELDS = (
+    (datetime, serializers.DateTimeField()),
+    (date, serializers.DateField()),
+    (time, serializers.TimeField()),
+)
+
+
+def to_csv_value(value):
+    # Nested categories and genres are written by their slugs.
+    if value is None:
+        return ''
+    for value_type, field in TEMPORAL_FIELDS:
+        if isinstance(value, value_type):
+            return field.to_representation(value)
+    if isinstance(value, dict):
+        return value['slug']
+    if isinstance(value, list):
+        return ','.join(to_csv_value(item) for item in value)
+    return value
+
+
+def render_csv(chunks, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields).encode()
+    for chunk in chunks:
+        yield ''.join(
+            writer.writerow([to_csv_value(item[name]) for name in fields])
+            for item in chunk
+        ).encode()
+
+
+FORMATS = {
+    'ndjson': ('application/x-ndjson', render_ndjson),
+    'csv': ('text/csv; charset=utf-8', render_csv),
+}
+
+
+def stream_export(name, file_format, chunk_size=None):
+    """
+    Bytes of the `name` export in `file_format`, produced chunk by chunk
+    so that memory does not grow with the number of objects.
+    """
+    model, serializer_class = EXPORTS[name]
+    serializer = serializer_class()
+    projection = RowProjection(serializer)
+    fields = [field_name for field_name, field in serializer.fields.items()
+              if not field.write_only]
+    chunks = iter_chunks(projection, model, chunk_size or CHUNK_SIZE)
+    _, render = FORMATS[file_format]
+    return render(chunks, fields)
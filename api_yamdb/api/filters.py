@@ -1,13 +1,26 @@
 from django_filters import CharFilter, FilterSet
+from rest_framework.filters import SearchFilter
 
 from .models import Titles
+from .search import search_titles
 
 
 class TitlesFilter(FilterSet):
     genre = CharFilter(field_name='genre__slug')
     category = CharFilter(field_name='category__slug')
-    name = CharFilter(field_name='name', lookup_expr='icontains')
+    name = CharFilter(method='filter_name')
 
     class Meta:
         model = Titles
         fields = ('name', 'year', 'genre', 'category')
+
+    def filter_name(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class TitlesSearchFilter(SearchFilter):
+
+    def filter_queryset(self, request, queryset, view):
+        for term in self.get_search_terms(request):
+            queryset = search_titles(queryset, term)
+        return queryset
@@ -0,0 +1,110 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Mails
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+RETRY_DELAY = timedelta(minutes=1)
+# How long a claimed message is left to its worker before another
+# worker may take it, e.g. after the first one crashed.
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def deliver_mail(subject, message, recipient):
+    """
+    Send a message right away or, with `EMAIL_DELIVERY = 'queued'`, put it
+    into the queue drained by `send_queued_mail`.
+    """
+    if settings.EMAIL_DELIVERY == 'queued':
+        Mails.objects.create(subject=subject, message=message,
+                             recipient=recipient)
+        return
+    send_mail(subject=subject, from_email=None, message=message,
+              recipient_list=(recipient,), fail_silently=True)
+
+
+def get_retry_time(attempts):
+    return timezone.now() + RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def claim_mails(batch_size, max_attempts):
+    """
+    Take up to `batch_size` due messages for the current worker by moving
+    their next attempt `CLAIM_TIMEOUT` ahead. A message is only claimed if
+    its next attempt did not change since it was read, so concurrent
+    workers never send the same message.
+    """
+    now = timezone.now()
+    due = Mails.objects.filter(
+        attempts__lt=max_attempts, next_attempt__lte=now
+    ).order_by('next_attempt', 'id')[:batch_size]
+    claimed = []
+    for mail in due:
+        taken = Mails.objects.filter(
+            pk=mail.pk, next_attempt=mail.next_attempt
+        ).update(next_attempt=now + CLAIM_TIMEOUT)
+        if taken:
+            claimed.append(mail)
+    return claimed
+
+
+def send_queued_mail(batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS):
+    """
+    Claim one batch of due messages and send it over a single backend
+    connection. Sent messages leave the queue; failed ones are retried
+    later with a doubling delay, up to `max_attempts` times.
+    Returns the numbers of sent and failed messages.
+    """
+    batch = claim_mails(batch_size, max_attempts)
+    if not batch:
+        return 0, 0
+
+    sent, failed = [], []
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for mail in batch:
+            email = EmailMessage(
+                subject=mail.subject, body=mail.message,
+                from_email=mail.from_email or None, to=(mail.recipient,),
+                connection=connection,
+            )
+            try:
+                email.send()
+            except Exception as error:
+                logger.warning('Не удалось отправить письмо %s: %s',
+                               mail.pk, error)
+                mail.attempts += 1
+                mail.next_attempt = get_retry_time(mail.attempts)
+                mail.last_error = str(error)
+                failed.append(mail)
+            else:
+                sent.append(mail.pk)
+    except Exception as error:
+        # The connection itself failed: retry the rest of the batch.
+        logger.warning('Не удалось подключиться к почтовому серверу: %s',
+                       error)
+        for mail in batch:
+            if mail.pk in sent or mail in failed:
+                continue
+            mail.attempts += 1
+            mail.next_attempt = get_retry_time(mail.attempts)
+            mail.last_error = str(error)
+            failed.append(mail)
+    finally:
+        connection.close()
+
+    with transaction.atomic():
+        Mails.objects.filter(pk__in=sent).delete()
+        Mails.objects.bulk_update(
+            failed, ('attempts', 'next_attempt', 'last_error')
+        )
+    return len(sent), len(failed)
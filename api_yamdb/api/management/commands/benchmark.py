@@ -0,0 +1,58 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from api.benchmarks.database import benchmark_database
+from api.benchmarks.dataset import seed
+from api.benchmarks.http import run_benchmark
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный тест всех эндпоинтов API на синтетических данных '
+            'во временной базе. Результат выводится в JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=1000,
+                            help='Количество произведений.')
+        parser.add_argument('--reviews', type=int, default=10,
+                            help='Количество отзывов на произведение.')
+        parser.add_argument('--comments', type=int, default=2,
+                            help='Количество комментариев к отзыву.')
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Количество запросов к каждому эндпоинту.')
+        parser.add_argument('--concurrency', type=int, default=8,
+                            help='Количество параллельных клиентов.')
+        parser.add_argument('--server', action='store_true',
+                            help='Отправлять запросы локальному '
+                                 'HTTP-серверу вместо тестового клиента.')
+        parser.add_argument('--throttling', action='store_true',
+                            help='Не отключать ограничение частоты '
+                                 'запросов.')
+        parser.add_argument('--output', help='Файл для результата.')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            refs = seed(
+                titles=options['titles'],
+                reviews_per_title=options['reviews'],
+                comments_per_review=options['comments'],
+            )
+            report = run_benchmark(
+                refs,
+                requests=options['requests'],
+                concurrency=options['concurrency'],
+                server=options['server'],
+                throttling=options['throttling'],
+            )
+
+        report['config'].update(
+            titles=options['titles'],
+            reviews_per_title=options['reviews'],
+            comments_per_review=options['comments'],
+        )
+        result = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                output.write(result)
+        else:
+            self.stdout.write(result)
@@ -0,0 +1,29 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from api.benchmarks.database import benchmark_database
+from api.benchmarks.dataset import seed
+from api.benchmarks.rendering import run_rendering_benchmark
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает скорость записи и разбора JSON стандартной '
+            'библиотекой и orjson на страницах произведений, отзывов и '
+            'комментариев. Результат выводится в JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100,
+                            help='Количество объектов на странице.')
+        parser.add_argument('--repeat', type=int, default=200,
+                            help='Количество повторов для каждой страницы.')
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        with benchmark_database():
+            seed(titles=page_size, reviews_per_title=1,
+                 comments_per_review=1)
+            report = run_rendering_benchmark(
+                page_size=page_size, repeat=options['repeat']
+            )
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
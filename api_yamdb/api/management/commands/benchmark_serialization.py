@@ -0,0 +1,29 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from api.benchmarks.database import benchmark_database
+from api.benchmarks.dataset import seed
+from api.benchmarks.serialization import run_serialization_benchmark
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает скорость выборки и сериализации страниц '
+            'произведений, отзывов и комментариев через объекты моделей и '
+            'через строки values(). Результат выводится в JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100,
+                            help='Количество объектов на странице.')
+        parser.add_argument('--repeat', type=int, default=50,
+                            help='Количество повторов для каждой страницы.')
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        with benchmark_database():
+            seed(titles=page_size, reviews_per_title=1,
+                 comments_per_review=1)
+            report = run_serialization_benchmark(
+                page_size=page_size, repeat=options['repeat']
+            )
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
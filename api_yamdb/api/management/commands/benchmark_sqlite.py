@@ -0,0 +1,37 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from api.benchmarks.database import benchmark_database
+from api.benchmarks.dataset import seed
+from api.benchmarks.sqlite import run_sqlite_benchmark
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность параллельных чтений и '
+            'записей отзывов с настройками SQLite по умолчанию и с '
+            'SQLITE_PRAGMAS и постоянными соединениями. Результат '
+            'выводится в JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=5000,
+                            help='Количество произведений.')
+        parser.add_argument('--duration', type=float, default=5.0,
+                            help='Длительность каждого прогона в секундах.')
+        parser.add_argument('--readers', type=int, default=4,
+                            help='Количество читающих клиентов.')
+        parser.add_argument('--writers', type=int, default=2,
+                            help='Количество пишущих клиентов.')
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            refs = seed(titles=options['titles'], reviews_per_title=10,
+                        comments_per_review=0)
+            report = run_sqlite_benchmark(
+                refs,
+                titles=options['titles'],
+                duration=options['duration'],
+                readers=options['readers'],
+                writers=options['writers'],
+            )
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
@@ -0,0 +1,26 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from api.benchmarks.throttling import run_throttle_benchmark
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает скорость и объём состояния классов ограничения '
+            'частоты запросов. Результат выводится в JSON.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=10000,
+                            help='Количество проверок для каждого класса.')
+        parser.add_argument('--keys', type=int, default=10,
+                            help='Количество разных клиентов.')
+        parser.add_argument('--rate', default='60/min',
+                            help='Ограничение частоты запросов.')
+
+    def handle(self, *args, **options):
+        report = run_throttle_benchmark(
+            requests=options['requests'],
+            keys=options['keys'],
+            rate=options['rate'],
+        )
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
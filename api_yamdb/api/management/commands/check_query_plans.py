@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.query_plans import find_full_scans
+
+
+class Command(BaseCommand):
+    help = ('Проверяет планы запросов всех viewset и завершается с ошибкой, '
+            'если запрос с фильтром читает таблицу целиком.')
+
+    def handle(self, *args, **options):
+        scans = find_full_scans()
+        for scan in scans:
+            self.stderr.write(
+                f'{scan.view}.{scan.action} {scan.params or ""}: '
+                f'полное чтение таблицы {scan.table}\n{scan.plan}'
+            )
+        if scans:
+            raise CommandError(f'Полных чтений таблиц: {len(scans)}')
+        self.stdout.write(self.style.SUCCESS('Полных чтений таблиц нет.'))
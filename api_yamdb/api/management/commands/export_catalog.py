@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from api.export import EXPORTS, FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    help = ('Выгружает все произведения, отзывы или комментарии в формате '
+            'NDJSON или CSV, не загружая их в память целиком.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=tuple(EXPORTS),
+                            help='Что выгрузить.')
+        parser.add_argument('--format', dest='file_format',
+                            choices=tuple(FORMATS), default='ndjson',
+                            help='Формат выгрузки.')
+        parser.add_argument('--chunk-size', type=int,
+                            help='Количество объектов, читаемых из базы '
+                                 'за раз.')
+        parser.add_argument('--output',
+                            help='Файл для выгрузки, по умолчанию stdout.')
+
+    def handle(self, *args, **options):
+        chunks = stream_export(options['name'], options['file_format'],
+                               chunk_size=options['chunk_size'])
+        if options['output']:
+            with open(options['output'], 'wb') as output:
+                output.writelines(chunks)
+        else:
+            # Chunks end on whole rows, so each one decodes on its own.
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending='')
@@ -0,0 +1,190 @@
+import csv
+import os
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from api.cache import bump_list_version
+from api.models import Categories, Comments, Genres, Reviews, Titles, User
+from api.search import normalize
+
+DATA_DIR = os.path.join(os.path.dirname(settings.BASE_DIR), 'data')
+BATCH_SIZE = 1000
+GenreTitle = Titles.genre.through
+
+
+def build_category(row):
+    return Categories(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def build_genre(row):
+    return Genres(id=row['id'], name=row['name'], slug=row['slug'])
+
+
+def build_user(row):
+    return User(
+        id=row['id'],
+        username=row['username'],
+        email=row['email'],
+        role=row['role'],
+        bio=row['description'],
+        first_name=row['first_name'],
+        last_name=row['last_name'],
+        is_staff=row['role'] == 'admin',
+        password=make_password(None),
+    )
+
+
+def build_title(row):
+    return Titles(
+        id=row['id'],
+        name=row['name'],
+        search_name=normalize(row['name']),
+        year=row['year'] or None,
+        description='',
+        category_id=row['category'] or None,
+    )
+
+
+def build_genre_title(row):
+    return GenreTitle(
+        id=row['id'], titles_id=row['title_id'], genres_id=row['genre_id']
+    )
+
+
+def build_review(row):
+    return Reviews(
+        id=row['id'],
+        title_id=row['title_id'],
+        author_id=row['author'],
+        text=row['text'],
+        score=row['score'],
+        pub_date=parse_datetime(row['pub_date']),
+    )
+
+
+def build_comment(row):
+    return Comments(
+        id=row['id'],
+        review_id=row['review_id'],
+        author_id=row['author'],
+        text=row['text'],
+        pub_date=parse_datetime(row['pub_date']),
+    )
+
+
+# Files in dependency order: every row only refers to rows loaded earlier.
+IMPORTS = (
+    ('category.csv', Categories, build_category),
+    ('genre.csv', Genres, build_genre),
+    ('users.csv', User, build_user),
+    ('titles.csv', Titles, build_title),
+    ('genre_title.csv', GenreTitle, build_genre_title),
+    ('review.csv', Reviews, build_review),
+    ('comments.csv', Comments, build_comment),
+)
+
+
+@contextmanager
+def keep_pub_date(model):
+    """
+    Stop `auto_now_add` from overwriting the publication date read from
+    the file while the rows are inserted.
+    """
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def batches(rows, size):
+    rows = iter(rows)
+    batch = list(islice(rows, size))
+    while batch:
+        yield batch
+        batch = list(islice(rows, size))
+
+
+class Command(BaseCommand):
+    help = ('Загружает данные из csv-файлов каталога data/ с сохранением '
+            'id. Уже загруженные строки пропускаются.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=DATA_DIR,
+            help='Каталог с csv-файлами.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество строк в одной транзакции.'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size должен быть больше нуля')
+        if not os.path.isdir(path):
+            raise CommandError(f'Каталог {path} не найден')
+
+        started = time.perf_counter()
+        total = 0
+        for filename, model, build in IMPORTS:
+            filepath = os.path.join(path, filename)
+            if not os.path.exists(filepath):
+                self.stdout.write(f'{filename}: файл не найден, пропущен')
+                continue
+            total += self.import_file(filepath, model, build, batch_size)
+
+        self.reset_sequences()
+        Titles.objects.rebuild_ratings()
+        # Rows are loaded with bulk_create, which sends no signals.
+        for model in (Categories, Genres):
+            bump_list_version(model)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Прочитано строк: {total} за {elapsed:.2f} с '
+            f'({total / elapsed:.0f} строк/с)'
+        ))
+
+    def import_file(self, filepath, model, build, batch_size):
+        started = time.perf_counter()
+        before = model.objects.count()
+        read = 0
+
+        with open(filepath, encoding='utf-8', newline='') as csv_file, \
+                keep_pub_date(model):
+            rows = (build(row) for row in csv.DictReader(csv_file))
+            for batch in batches(rows, batch_size):
+                with transaction.atomic():
+                    model.objects.bulk_create(batch, ignore_conflicts=True)
+                read += len(batch)
+
+        elapsed = time.perf_counter() - started
+        skipped = read - (model.objects.count() - before)
+        self.stdout.write(
+            f'{os.path.basename(filepath)}: {read} строк, '
+            f'пропущено {skipped}, {elapsed:.2f} с '
+            f'({read / elapsed:.0f} строк/с)'
+        )
+        return read
+
+    def reset_sequences(self):
+        models = [model for _, model, _ in IMPORTS]
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Titles
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые рейтинги произведений по отзывам.'
+
+    def handle(self, *args, **options):
+        updated = Titles.objects.rebuild_ratings()
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитан рейтинг произведений: {updated}')
+        )
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.mail import BATCH_SIZE, MAX_ATTEMPTS, send_queued_mail
+
+
+class Command(BaseCommand):
+    help = ('Отправляет письма из очереди пачками через одно соединение '
+            'с почтовым сервером.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help='Количество писем в одной пачке.')
+        parser.add_argument('--max-attempts', type=int,
+                            default=MAX_ATTEMPTS,
+                            help='Количество попыток отправки письма.')
+        parser.add_argument('--loop', action='store_true',
+                            help='Работать постоянно, проверяя очередь.')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Пауза между проверками пустой очереди, с.')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = send_queued_mail(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+            )
+            if sent or failed:
+                self.stdout.write(
+                    f'Отправлено писем: {sent}, ошибок: {failed}'
+                )
+            if not options['loop']:
+                break
+            if sent + failed < options['batch_size']:
+                time.sleep(options['interval'])
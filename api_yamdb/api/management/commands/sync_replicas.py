@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.replicas import sync_replicas
+
+
+class Command(BaseCommand):
+    help = ('Копирует основную базу SQLite в файлы реплик из DB_REPLICAS. '
+            'С --interval повторяет копирование, пока его не прервут.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float,
+                            help='Пауза между копированиями в секундах.')
+
+    def handle(self, *args, **options):
+        if not settings.DATABASE_REPLICAS:
+            raise CommandError('Реплики не настроены: задайте DB_REPLICAS.')
+
+        interval = options['interval']
+        while True:
+            started = time.perf_counter()
+            sync_replicas()
+            self.stdout.write(
+                f'Реплик обновлено: {len(settings.DATABASE_REPLICAS)} за '
+                f'{time.perf_counter() - started:.3f} с'
+            )
+            if interval is None:
+                break
+            time.sleep(interval)
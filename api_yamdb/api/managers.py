@@ -1,5 +1,29 @@
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import AbstractUser, UserManager
+from django.db import IntegrityError, models, transaction
+from django.db.models import (
+    Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value,
+    When
+)
+from django.db.models.functions import Cast, Coalesce, Round
+from django.utils import timezone
+
+from .search import normalize
+
+
+class RoundTo(Round):
+    arity = 2
+    output_field = FloatField()
+
+
+def rating_expression():
+    return Case(
+        When(review_count=0, then=Value(None)),
+        default=RoundTo(
+            Cast(F('score_sum'), FloatField()) / F('review_count'), 2
+        ),
+        output_field=FloatField(),
+    )
 
 
 class APIUserManager(UserManager):
@@ -30,6 +54,24 @@ class APIUserManager(UserManager):
         return self._create_user(email=email, username=username,
                                  password=password, **extra_fields)
 
+    def get_or_create_by_email(self, email):
+        """
+        The user with `email`, created with the 'user' role on the first
+        login. An existing user costs one lookup by the unique email index,
+        which also settles concurrent first logins with the same email.
+        """
+        email = self.normalize_email(email)
+        try:
+            return self.get(email=email)
+        except self.model.DoesNotExist:
+            pass
+
+        try:
+            with transaction.atomic(using=self.db):
+                return self.create_user(email=email, role='user')
+        except IntegrityError:
+            return self.get(email=email)
+
     def create_superuser(self, email, username=None, password=None,
                          **extra_fields):
         extra_fields['is_staff'] = True
@@ -43,3 +85,60 @@ class APIUserManager(UserManager):
 
         return self._create_user(email=email, username=username,
                                  password=password, **extra_fields)
+
+
+class TitlesManager(models.Manager):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        # save() is skipped, so the search name is filled here.
+        for obj in objs:
+            obj.search_name = normalize(obj.name)
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def update_rating(self, title_id, score_delta, count_delta):
+        """
+        Shift the stored score sum and review count of a title by the given
+        deltas and recalculate its rating from the new values.
+        The title is marked as modified.
+        """
+        with transaction.atomic(using=self.db):
+            self.filter(pk=title_id).update(
+                score_sum=F('score_sum') + score_delta,
+                review_count=F('review_count') + count_delta,
+                modified=timezone.now(),
+            )
+            self.filter(pk=title_id).update(rating=rating_expression())
+
+    def rebuild_ratings(self):
+        """
+        Recalculate the rating fields of every title from its reviews.
+        Returns the number of updated titles.
+        """
+        from .models import Reviews
+
+        reviews = Reviews.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        score_sum = reviews.annotate(total=Sum('score')).values('total')
+        review_count = reviews.annotate(total=Count('pk')).values('total')
+
+        with transaction.atomic(using=self.db):
+            updated = self.update(
+                score_sum=Coalesce(
+                    Subquery(score_sum, output_field=IntegerField()), 0
+                ),
+                review_count=Coalesce(
+                    Subquery(review_count, output_field=IntegerField()), 0
+                ),
+                modified=timezone.now(),
+            )
+            self.update(rating=rating_expression())
+
+        return updated
+
+    def touch(self, **filters):
+        """
+        Mark the titles matching the filters as modified, e.g. when a
+        related category or genre changes their representation.
+        """
+        return self.filter(**filters).update(modified=timezone.now())
@@ -0,0 +1,64 @@
+from contextvars import ContextVar
+from time import perf_counter
+
+current_metrics = ContextVar('current_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    Timings of a single request. Doubles as a database execute wrapper
+    that counts the queries and sums up their duration.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.serializer = 0.0
+        self.serializing = False
+        self.view_started = None
+        self.view = None
+        self.render = None
+        self.total = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db += perf_counter() - started
+
+    def as_dict(self):
+        durations = {
+            'db': self.db,
+            'serializer': self.serializer,
+            'view': self.view,
+            'render': self.render,
+            'total': self.total,
+        }
+        return {
+            name: round(duration * 1000, 3)
+            for name, duration in durations.items()
+            if duration is not None
+        }
+
+
+class TimedSerializerMixin:
+    """
+    Add the time spent in `to_representation` to the metrics of the
+    current request. Nested serializers are counted once, as part of
+    the outermost one.
+    """
+
+    def to_representation(self, instance):
+        metrics = current_metrics.get()
+        if metrics is None or metrics.serializing:
+            return super().to_representation(instance)
+
+        metrics.serializing = True
+        started = perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializing = False
+            metrics.serializer += perf_counter() - started
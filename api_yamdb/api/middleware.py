@@ -0,0 +1,141 @@
+import json
+import logging
+from contextlib import ExitStack
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import RequestMetrics, current_metrics
+from .replicas import PIN_COOKIE, RoutingState, current_routing, pin_user
+
+logger = logging.getLogger('api.metrics')
+
+REPLICA_METHODS = ('GET', 'HEAD')
+
+
+class RequestMetricsMiddleware:
+    """
+    Measure the number of SQL queries, the database, serializer, view and
+    render time of every request. The results are sent in the
+    `X-Query-Count` and `Server-Timing` headers and logged as one JSON
+    line; streaming responses are logged once their content is sent.
+    Queries are counted by execute wrappers, so `DEBUG` may stay
+    off. Should be placed first in `MIDDLEWARE`.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        request.metrics = metrics
+        started = perf_counter()
+        response = self.measure(metrics, self.get_response, request)
+        if metrics.view is None and metrics.view_started is not None:
+            metrics.view = perf_counter() - metrics.view_started
+
+        if response.streaming:
+            # The content is produced, and queried, while the server sends
+            # it, after the headers are gone: the results are only logged.
+            response.streaming_content = self.measure_stream(
+                request, response, iter(response.streaming_content),
+                metrics, started
+            )
+            return response
+
+        metrics.total = perf_counter() - started
+        timings = metrics.as_dict()
+        response['X-Query-Count'] = str(metrics.queries)
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={duration}' for name, duration in timings.items()
+        )
+        self.log(request, response, metrics)
+        return response
+
+    @staticmethod
+    def measure(metrics, func, *args):
+        token = current_metrics.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                return func(*args)
+        finally:
+            current_metrics.reset(token)
+
+    def measure_stream(self, request, response, chunks, metrics, started):
+        """
+        Streaming content that counts the queries made for every chunk and
+        logs the request once the stream is exhausted or closed.
+        """
+        try:
+            while True:
+                chunk = self.measure(metrics, next, chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            metrics.total = perf_counter() - started
+            self.log(request, response, metrics)
+
+    def log(self, request, response, metrics):
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            **{f'{name}_ms': duration
+               for name, duration in metrics.as_dict().items()},
+        }))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.metrics.view_started = perf_counter()
+
+    def process_template_response(self, request, response):
+        # Called right after the view returns and before rendering, since
+        # the middleware comes first and template hooks run in reverse.
+        metrics = request.metrics
+        finished = perf_counter()
+        if metrics.view_started is not None:
+            metrics.view = finished - metrics.view_started
+
+        def measure_render(response):
+            metrics.render = perf_counter() - finished
+
+        response.add_post_render_callback(measure_render)
+        return response
+
+
+class ReplicaPinningMiddleware:
+    """
+    Let GET and HEAD requests read from the replicas chosen by
+    `api.replicas.ReplicaRouter`. Other requests read from the primary,
+    and so do the requests of a user who wrote in the last
+    `REPLICA_PIN_SECONDS`, so that users see their own changes before
+    the replicas catch up. Users are pinned by id once authenticated,
+    see `api.replicas.route_user`; anonymous clients, and clients that
+    keep cookies, are also pinned with a cookie.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState(pinned=(
+            request.method not in REPLICA_METHODS
+            or PIN_COOKIE in request.COOKIES
+        ))
+        token = current_routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+
+        if state.wrote and settings.DATABASE_REPLICAS:
+            if state.user_id is not None:
+                pin_user(state.user_id)
+            response.set_cookie(PIN_COOKIE, '1',
+                                max_age=settings.REPLICA_PIN_SECONDS,
+                                httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+from django.db.models import Avg, Count, Sum
+
+
+def fill_ratings(apps, schema_editor):
+    Titles = apps.get_model('api', 'Titles')
+    stats = Titles.objects.annotate(
+        total=Sum('reviews__score'),
+        amount=Count('reviews'),
+        average=Avg('reviews__score'),
+    ).values_list('pk', 'total', 'amount', 'average')
+
+    for pk, total, amount, average in stats.iterator():
+        if not amount:
+            continue
+        Titles.objects.filter(pk=pk).update(
+            score_sum=total,
+            review_count=amount,
+            rating=round(average, 2),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_auto_20210721_0041'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='titles',
+            name='score_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.AddField(
+            model_name='titles',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='titles',
+            name='rating',
+            field=models.FloatField(editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_titles_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='titles',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+        migrations.AddField(
+            model_name='reviews',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения отзыва'),
+        ),
+        migrations.AddField(
+            model_name='comments',
+            name='modified',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения комментария'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+import unicodedata
+
+from django.db import migrations, models
+
+
+def normalize(value):
+    # A copy of api.search.normalize as it was when this migration was
+    # written, so that later changes to it do not change the history.
+    return unicodedata.normalize('NFKC', value).casefold()
+
+
+def fill_search_names(apps, schema_editor):
+    Titles = apps.get_model('api', 'Titles')
+    for title in Titles.objects.only('name').iterator():
+        Titles.objects.filter(pk=title.pk).update(
+            search_name=normalize(title.name)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_modified'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='titles',
+            name='search_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=200, verbose_name='Название для поиска'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_search_names, migrations.RunPython.noop),
+    ]
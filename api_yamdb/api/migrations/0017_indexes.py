@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_mails'),
+    ]
+
+    operations = [
+        # The title goes first, so that the constraint also serves the
+        # duplicate check of a new review.
+        migrations.RemoveConstraint(
+            model_name='reviews',
+            name='reviews-unique-author',
+        ),
+        migrations.AddConstraint(
+            model_name='reviews',
+            constraint=models.UniqueConstraint(fields=('title', 'author'), name='reviews-unique-author'),
+        ),
+        migrations.AddIndex(
+            model_name='reviews',
+            index=models.Index(fields=['title', '-id'], name='reviews-title-id'),
+        ),
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['review', '-id'], name='comments-review-id'),
+        ),
+        migrations.AddIndex(
+            model_name='titles',
+            index=models.Index(fields=['year', '-id'], name='titles-year-id'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0017_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reviews',
+            name='score',
+            field=models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1, 'Меньше 1 поставить нельзя'), django.core.validators.MaxValueValidator(10, 'Больше 10 поставить нельзя')], verbose_name='Оценка'),
+        ),
+    ]
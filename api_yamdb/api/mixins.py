@@ -0,0 +1,198 @@
+import hashlib
+import time
+from datetime import datetime
+
+from rest_framework import serializers, status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.functional import cached_property
+from django.utils.http import http_date, quote_etag
+
+from .projections import RowProjection, UnsupportedField
+
+
+class ConditionalGetMixin:
+    """
+    Answer `list` and `retrieve` with 304 Not Modified when the client
+    already holds the current representation.
+
+    Views describe a response by `get_list_state` and `get_object_state`:
+    a tuple of values that changes whenever the response does, such as
+    modification dates and row counts. `None` skips the check.
+    """
+
+    def get_list_state(self):
+        return None
+
+    def get_object_state(self):
+        return None
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            self.get_list_state, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            self.get_object_state, super().retrieve, request, *args,
+            **kwargs
+        )
+
+    def get_conditional_response(self, get_state, action, request, *args,
+                                 **kwargs):
+        try:
+            state = get_state()
+        except (TypeError, ValueError):
+            # Malformed lookups are left for the action to answer with 404.
+            state = None
+        if state is None:
+            return action(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators(state)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = action(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                # Last-Modified has a resolution of one second: while the
+                # second is running, a later change in it would still be
+                # answered with 304, so an earlier second is sent.
+                response['Last-Modified'] = http_date(
+                    min(last_modified, int(time.time()) - 1)
+                )
+        return response
+
+    def get_validators(self, state):
+        source = repr((
+            self.request.get_full_path(),
+            self.request.accepted_media_type,
+            state,
+        ))
+        etag = quote_etag(hashlib.md5(source.encode()).hexdigest())
+
+        dates = [value for value in state if isinstance(value, datetime)]
+        last_modified = int(max(dates).timestamp()) if dates else None
+        return etag, last_modified
+
+
+class BulkCreateMixin:
+    """
+    Accept a JSON array on `create` and save all of its objects at once
+    with the `list_serializer_class` of the serializer. The response
+    lists the created objects or the errors of every item.
+    """
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        limit = settings.BULK_CREATE_LIMIT
+        if len(request.data) > limit:
+            raise serializers.ValidationError({
+                'non_field_errors': [
+                    f'За один запрос можно создать не больше {limit} '
+                    f'объектов.'
+                ]
+            })
+        serializer = self.get_serializer(data=request.data, many=True,
+                                         allow_empty=False)
+        serializer.is_valid(raise_exception=True)
+        self.perform_bulk_create(serializer)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def perform_bulk_create(self, serializer):
+        serializer.save()
+
+
+def parse_field_names(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def get_sparse_fields(request, available):
+    """
+    Names of the `available` fields left in the response of a safe-method
+    request by the comma separated `?fields=` and `?exclude=` parameters,
+    or `None` when the response is not narrowed.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = request.query_params
+    if 'fields' not in params and 'exclude' not in params:
+        return None
+
+    requested = parse_field_names(params.get('fields', ''))
+    excluded = parse_field_names(params.get('exclude', ''))
+    errors = {}
+    for param, names in (('fields', requested), ('exclude', excluded)):
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            errors[param] = [f'Неизвестные поля: {", ".join(unknown)}.']
+    if errors:
+        raise serializers.ValidationError(errors)
+
+    fields = requested or available
+    return [name for name in fields if name not in excluded]
+
+
+class SparseFieldsSerializerMixin:
+    """Serializer that drops the fields left out by `get_sparse_fields`."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = get_sparse_fields(self.context.get('request'),
+                                   list(self.fields))
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsMixin:
+    """
+    View whose queryset skips the joins and prefetches of the fields left
+    out of the response by `?fields=` and `?exclude=`.
+    """
+
+    @cached_property
+    def sparse_fields(self):
+        return get_sparse_fields(
+            self.request, list(self.get_serializer_class().Meta.fields)
+        )
+
+    def wants_field(self, name):
+        return self.sparse_fields is None or name in self.sparse_fields
+
+
+class ValuesListMixin:
+    """
+    Answer `list` from `values()` rows turned into dicts by a
+    `RowProjection` of the serializer instead of serializing model
+    instances. Serializers with fields the projection cannot follow keep
+    the usual path.
+    """
+
+    def get_projection(self):
+        try:
+            return RowProjection(self.get_serializer())
+        except UnsupportedField:
+            return None
+
+    def list(self, request, *args, **kwargs):
+        projection = self.get_projection()
+        if projection is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.prefetch_related(None).values(
+            *projection.columns
+        )
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(projection.represent(queryset))
+        return self.get_paginated_response(projection.represent(page))
@@ -1,12 +1,15 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.db.models import (
-    CharField, CheckConstraint, EmailField, Q, TextField
+    CharField, CheckConstraint, EmailField, Index, Q, TextField,
+    UniqueConstraint
 )
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MaxValueValidator, MinValueValidator
 
-from .managers import APIUserManager
+from .managers import APIUserManager, TitlesManager
+from .search import normalize
 from .validators import (custom_year_validator)
 
 
@@ -65,7 +68,20 @@ class Reviews(models.Model):
     pub_date = models.DateTimeField(verbose_name='Дата публикации отзыва',
                                     auto_now_add=True)
     score = models.PositiveSmallIntegerField(verbose_name='Оценка',
-                                             choices=CHOOSE_RATING)
+                                             validators=CHOOSE_RATING)
+    modified = models.DateTimeField(verbose_name='Дата изменения отзыва',
+                                    auto_now=True)
+
+    class Meta:
+        verbose_name = 'Отзыв'
+        verbose_name_plural = 'Отзывы'
+        constraints = (
+            UniqueConstraint(fields=('title', 'author'),
+                             name='reviews-unique-author'),
+        )
+        indexes = (
+            Index(fields=('title', '-id'), name='reviews-title-id'),
+        )
 
 
 class Comments(models.Model):
@@ -77,10 +93,16 @@ class Comments(models.Model):
     text = models.TextField(verbose_name='Текст комментария')
     pub_date = models.DateTimeField(verbose_name='Дата добавления комментария',
                                     auto_now_add=True, )
+    modified = models.DateTimeField(
+        verbose_name='Дата изменения комментария', auto_now=True
+    )
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            Index(fields=('review', '-id'), name='comments-review-id'),
+        )
 
     def __str__(self):
         return self.text[:15]
@@ -114,6 +136,12 @@ class Genres(models.Model):
 
 class Titles(models.Model):
     name = models.CharField(verbose_name='Название', max_length=200)
+    search_name = models.CharField(
+        verbose_name='Название для поиска',
+        max_length=200,
+        db_index=True,
+        editable=False
+    )
     year = models.IntegerField(
         null=True,
         verbose_name='Год',
@@ -137,10 +165,79 @@ class Titles(models.Model):
         verbose_name='Категория',
         related_name='titles'
     )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+        editable=False
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False
+    )
+    modified = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True
+    )
+
+    objects = TitlesManager()
+
+    AGGREGATE_FIELDS = ('score_sum', 'review_count', 'rating')
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = (
+            Index(fields=('year', '-id'), name='titles-year-id'),
+        )
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        self.search_name = normalize(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            update_fields = {*update_fields, 'search_name'}
+        if not self._state.adding and not kwargs.get('force_insert'):
+            # The rating aggregates are only written by update_rating and
+            # rebuild_ratings: an instance read before a review was
+            # posted would otherwise write its old numbers back.
+            if update_fields is None:
+                update_fields = {
+                    field.name for field in self._meta.concrete_fields
+                    if not field.primary_key
+                }
+            update_fields = set(update_fields) - set(self.AGGREGATE_FIELDS)
+        if update_fields is not None:
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
+
+class Mails(models.Model):
+    subject = models.CharField(verbose_name='Тема', max_length=200)
+    message = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(verbose_name='Отправитель', blank=True)
+    recipient = models.EmailField(verbose_name='Получатель')
+    created = models.DateTimeField(verbose_name='Дата создания',
+                                   auto_now_add=True)
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Попыток отправки', default=0
+    )
+    next_attempt = models.DateTimeField(
+        verbose_name='Следующая попытка', default=timezone.now, db_index=True
+    )
+    last_error = models.TextField(verbose_name='Последняя ошибка',
+                                  blank=True)
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,12 @@
+from rest_framework.negotiation import DefaultContentNegotiation
+
+
+class IgnoreClientContentNegotiation(DefaultContentNegotiation):
+    """
+    Render with the first renderer whatever the client accepts, for views
+    whose format comes from the URL rather than the Accept header.
+    Parsers are chosen by the content type as usual.
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
@@ -0,0 +1,31 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class IdCursorPagination(CursorPagination):
+    ordering = '-id'
+
+
+class PageNumberOrCursorPagination(PageNumberPagination):
+    """
+    Page number pagination that switches to keyset pagination by `id`
+    when the request carries the `cursor` query parameter. An empty
+    `cursor` opens the first page; cursor pages skip `COUNT(*)` and
+    `OFFSET`, so their cost does not depend on the depth.
+    """
+    cursor_pagination_class = IdCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor_query_param = self.cursor_pagination_class.cursor_query_param
+        if cursor_query_param not in request.query_params:
+            self.cursor_paginator = None
+            return super().paginate_queryset(queryset, request, view)
+
+        self.cursor_paginator = self.cursor_pagination_class()
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is None:
+            return super().get_paginated_response(data)
+        return self.cursor_paginator.get_paginated_response(data)
@@ -0,0 +1,37 @@
+import codecs
+import io
+import re
+
+from rest_framework.parsers import JSONParser
+
+from django.conf import settings
+
+from .renderers import FastJSONRenderer, orjson
+
+# orjson reads integers beyond 64 bits as floats.
+LONG_NUMBER = re.compile(rb'\d{19}')
+
+
+class FastJSONParser(JSONParser):
+    """
+    `JSONParser` that decodes UTF-8 bodies with orjson. Other encodings,
+    bodies orjson rejects and bodies with numbers it could read
+    differently go to the stdlib parser, so the result and the error
+    messages stay the same.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding',
+                                              settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        data = stream.read()
+        if not LONG_NUMBER.search(data):
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(data), media_type, parser_context)
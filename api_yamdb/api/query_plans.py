@@ -0,0 +1,86 @@
+import re
+from collections import namedtuple
+
+from rest_framework.test import APIRequestFactory
+
+from django.db import connections
+from django.db.models.lookups import Lookup
+from django.db.models.sql.where import WhereNode
+
+# A table read from start to end, as SQLite reports it; index scans and
+# virtual tables carry more words after the name.
+FULL_SCAN = re.compile(r'\bSCAN (?:TABLE )?(\w+)\s*$')
+# Lookups that an index on the column could serve.
+SEEKABLE_LOOKUPS = {'exact', 'in', 'gt', 'gte', 'lt', 'lte', 'range'}
+# Filters of the list actions that should not need full scans.
+SAMPLE_PARAMS = {
+    'titles': (
+        {'year': '2000'}, {'genre': 'slug'}, {'category': 'slug'},
+        {'name': 'поиск'},
+    ),
+}
+SAMPLE_KWARGS = {'title_id': '1', 'review_id': '1'}
+SAMPLE_LOOKUP = '1'
+
+FullScan = namedtuple('FullScan', ('view', 'action', 'params', 'table',
+                                   'plan'))
+
+
+def has_seekable_lookup(node):
+    for child in node.children:
+        if isinstance(child, WhereNode):
+            if has_seekable_lookup(child):
+                return True
+        elif (isinstance(child, Lookup)
+              and child.lookup_name in SEEKABLE_LOOKUPS):
+            return True
+    return False
+
+
+def get_querysets(viewset, basename):
+    """
+    Querysets a viewset runs for `list` and `retrieve` on the sample
+    requests: the list page with its filters and the object lookup.
+    """
+    factory = APIRequestFactory()
+    for params in ({}, *SAMPLE_PARAMS.get(basename, ())):
+        for action in ('list', 'retrieve'):
+            view = viewset(action_map={'get': action})
+            view.args = ()
+            view.kwargs = dict(SAMPLE_KWARGS)
+            view.format_kwarg = None
+            view.request = view.initialize_request(factory.get('/', params))
+            queryset = view.filter_queryset(view.get_queryset())
+            if action == 'list':
+                queryset = queryset[:10]
+            else:
+                queryset = queryset.filter(
+                    **{view.lookup_field: SAMPLE_LOOKUP}
+                )
+            yield action, params, queryset
+
+
+def find_full_scans(router=None):
+    """
+    Run EXPLAIN on the querysets of every viewset of `router` and return
+    the full table scans of queries that filter by a column an index
+    could seek on. Unfiltered lists and substring searches read the
+    table in order anyway and are not reported. Only SQLite plans are
+    understood.
+    """
+    if router is None:
+        from .urls import router_v1 as router
+
+    scans = []
+    for _, viewset, basename in router.registry:
+        for action, params, queryset in get_querysets(viewset, basename):
+            if (connections[queryset.db].vendor != 'sqlite'
+                    or not has_seekable_lookup(queryset.query.where)):
+                continue
+            plan = queryset.explain()
+            for line in plan.splitlines():
+                match = FULL_SCAN.search(line)
+                if match:
+                    scans.append(FullScan(viewset.__name__, action, params,
+                                          match.group(1), plan))
+    return scans
@@ -0,0 +1,117 @@
+import random
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = 'primary_pin'
+USER_PIN_KEY = 'replica-pin:{pk}'
+
+
+class RoutingState:
+    """
+    Where the reads of the current request go. `pinned` requests read
+    from the primary; `wrote` is set once anything was routed for
+    writing. `user_id` is the authenticated user, once known.
+    """
+
+    def __init__(self, pinned):
+        self.pinned = pinned
+        self.wrote = False
+        self.user_id = None
+
+
+current_routing = ContextVar('current_routing', default=None)
+
+
+def pin_user(user_id):
+    """Make the reads of user `user_id` go to the primary for a while."""
+    cache.set(USER_PIN_KEY.format(pk=user_id), True,
+              settings.REPLICA_PIN_SECONDS)
+
+
+def route_user(user_id):
+    """
+    Called once the user of the current request is authenticated: a user
+    who wrote within `REPLICA_PIN_SECONDS` reads from the primary, from
+    whatever client the request comes.
+    """
+    state = current_routing.get()
+    if state is None:
+        return
+    state.user_id = user_id
+    if not state.pinned and settings.DATABASE_REPLICAS:
+        state.pinned = bool(cache.get(USER_PIN_KEY.format(pk=user_id)))
+
+
+@contextmanager
+def use_primary():
+    """
+    Read from the primary inside the block. Used for data put into
+    caches shared by all clients, which a lagging replica would fill
+    with stale rows that outlive the replica lag.
+    """
+    state = current_routing.get()
+    if state is None or state.pinned:
+        yield
+        return
+    state.pinned = True
+    try:
+        yield
+    finally:
+        state.pinned = state.wrote
+
+
+class ReplicaRouter:
+    """
+    Send the reads of unpinned requests to a random database of
+    `DATABASE_REPLICAS` and everything else to the primary. Requests are
+    unpinned by `ReplicaPinningMiddleware` only; management commands,
+    shells and background work always use the primary. Routing a write
+    pins the rest of the request to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        state = current_routing.get()
+        if state is None or state.pinned or not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas are copies of the primary and are never migrated.
+        return db not in settings.DATABASE_REPLICAS
+
+
+def sync_replicas(source=DEFAULT_DB_ALIAS):
+    """
+    Copy the SQLite primary into every replica file with the online
+    backup API. Each copy is one transaction on the replica, so its
+    readers see either the old or the new data, and the connections they
+    keep open pick up the change.
+    """
+    primary = connections[source]
+    primary.ensure_connection()
+    for alias in settings.DATABASE_REPLICAS:
+        target = sqlite3.connect(
+            connections.databases[alias]['NAME'],
+            timeout=settings.SQLITE_PRAGMAS.get('busy_timeout', 5000) / 1000,
+        )
+        try:
+            primary.connection.backup(target)
+        finally:
+            target.close()
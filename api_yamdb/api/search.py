@@ -0,0 +1,109 @@
+import unicodedata
+
+from django.db import DatabaseError, connections
+from django.db.models.expressions import RawSQL
+
+SEARCH_TABLE = 'api_titles_search'
+# Trigram tokens cannot match shorter queries.
+MIN_INDEXED_LENGTH = 3
+
+CREATE_SEARCH_TABLE = (
+    f'CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5('
+    "search_name, content='api_titles', content_rowid='id', "
+    "tokenize='trigram')"
+)
+SEARCH_TRIGGERS = {
+    f'{SEARCH_TABLE}_insert': (
+        'AFTER INSERT ON api_titles BEGIN '
+        f'INSERT INTO {SEARCH_TABLE}(rowid, search_name) '
+        'VALUES (new.id, new.search_name); END'
+    ),
+    f'{SEARCH_TABLE}_delete': (
+        'AFTER DELETE ON api_titles BEGIN '
+        f'INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, search_name) '
+        "VALUES ('delete', old.id, old.search_name); END"
+    ),
+    f'{SEARCH_TABLE}_update': (
+        'AFTER UPDATE OF id, search_name ON api_titles BEGIN '
+        f'INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, search_name) '
+        "VALUES ('delete', old.id, old.search_name); "
+        f'INSERT INTO {SEARCH_TABLE}(rowid, search_name) '
+        'VALUES (new.id, new.search_name); END'
+    ),
+}
+MATCH_SQL = f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s'
+
+_search_index_available = {}
+
+
+class RawSubquery(RawSQL):
+    """
+    Raw SELECT for the right-hand side of `__in`. The lookup already puts
+    it in parentheses, and SQLite reads `IN ((SELECT ...))` as a scalar
+    subquery that gives its first row only.
+    """
+
+    def as_sql(self, compiler, connection):
+        return self.sql, self.params
+
+
+def normalize(value):
+    """Casefold a title name, so that Cyrillic letters compare too."""
+    return unicodedata.normalize('NFKC', value).casefold()
+
+
+def ensure_search_index(using='default', **kwargs):
+    """
+    Create the SQLite FTS5 index over `Titles.search_name` and the
+    triggers that keep it in sync. SQLite drops the triggers whenever a
+    migration rebuilds the titles table, so this runs after every
+    `migrate` and reindexes the titles if a trigger had to be recreated.
+    """
+    connection = connections[using]
+    _search_index_available.pop(using, None)
+    if connection.vendor != 'sqlite':
+        return
+    if 'api_titles' not in connection.introspection.table_names():
+        return
+
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(CREATE_SEARCH_TABLE)
+        except DatabaseError:
+            # SQLite is built without FTS5 or the trigram tokenizer.
+            return
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        )
+        existing = {name for name, in cursor.fetchall()}
+        missing = set(SEARCH_TRIGGERS) - existing
+        for name in missing:
+            cursor.execute(f'CREATE TRIGGER {name} {SEARCH_TRIGGERS[name]}')
+        if missing:
+            cursor.execute(
+                f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) "
+                "VALUES ('rebuild')"
+            )
+
+
+def is_search_index_available(using):
+    if using not in _search_index_available:
+        connection = connections[using]
+        _search_index_available[using] = (
+            connection.vendor == 'sqlite'
+            and SEARCH_TABLE in connection.introspection.table_names()
+        )
+    return _search_index_available[using]
+
+
+def search_titles(queryset, query):
+    """
+    Keep the titles whose names contain the query, ignoring case.
+    Uses the FTS5 trigram index when the database has one.
+    """
+    query = normalize(query)
+    if (len(query) >= MIN_INDEXED_LENGTH
+            and is_search_index_available(queryset.db)):
+        phrase = '"{}"'.format(query.replace('"', '""'))
+        return queryset.filter(id__in=RawSubquery(MATCH_SQL, (phrase,)))
+    return queryset.filter(search_name__contains=query)
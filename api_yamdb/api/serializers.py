@@ -3,6 +3,9 @@ from rest_framework import serializers
 
 from django.conf import settings
 
+from .bulk import BatchSlugRelatedField, BulkListSerializer
+from .metrics import TimedSerializerMixin
+from .mixins import SparseFieldsSerializerMixin
 from .models import Categories, Comments, Genres, Reviews, Titles, User
 
 
@@ -38,7 +41,8 @@ class TokenReceiveSerializer(serializers.Serializer):
         return attrs
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(TimedSerializerMixin, SparseFieldsSerializerMixin,
+                     serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('first_name', 'last_name', 'username',
@@ -76,7 +80,8 @@ class UserSerializer(serializers.ModelSerializer):
         return data
 
 
-class ReviewsSerializer(serializers.ModelSerializer):
+class ReviewsSerializer(TimedSerializerMixin, SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True,
@@ -101,7 +106,7 @@ class ReviewsSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date', 'title')
 
 
-class CommentsSerializer(serializers.ModelSerializer):
+class CommentsSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         slug_field='username',
         read_only=True,
@@ -112,45 +117,45 @@ class CommentsSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date')
 
 
-class CategoriesSerializer(serializers.ModelSerializer):
+class CategoriesSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Categories
         fields = ('name', 'slug')
+        list_serializer_class = BulkListSerializer
 
 
-class GenresSerializer(serializers.ModelSerializer):
+class GenresSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Genres
         fields = ('name', 'slug')
+        list_serializer_class = BulkListSerializer
 
 
-class TitleBaseSerializer(serializers.ModelSerializer):
-    rating = serializers.SerializerMethodField()
-
+class TitleBaseSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Titles
         fields = ('id', 'name', 'year', 'description', 'genre',
                   'category', 'rating')
-
-    def get_rating(self, obj):
-        if hasattr(obj, 'rating'):
-            return obj.rating
-        return None
+        read_only_fields = ('rating',)
 
 
 class TitlesUnSafeMethodSerializer(TitleBaseSerializer):
-    genre = serializers.SlugRelatedField(
+    genre = BatchSlugRelatedField(
         slug_field='slug',
         many=True,
         queryset=Genres.objects.all(),
     )
-    category = serializers.SlugRelatedField(
+    category = BatchSlugRelatedField(
         slug_field='slug',
         queryset=Categories.objects.all(),
         required=False
     )
 
+    class Meta(TitleBaseSerializer.Meta):
+        list_serializer_class = BulkListSerializer
+
 
-class TitlesSafeMethodSerializer(TitleBaseSerializer):
+class TitlesSafeMethodSerializer(SparseFieldsSerializerMixin,
+                                 TitleBaseSerializer):
     genre = GenresSerializer(many=True)
     category = CategoriesSerializer()
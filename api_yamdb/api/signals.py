@@ -0,0 +1,124 @@
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete, pre_save
+)
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .authentication import revoke_claims, user_cache
+from .cache import bump_list_version
+from .models import Categories, Comments, Genres, Reviews, Titles, User
+
+
+@receiver(pre_save, sender=Reviews)
+def remember_previous_score(sender, instance, **kwargs):
+    instance._previous_rating_state = None
+    if instance.pk is None:
+        return
+    instance._previous_rating_state = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list('title_id', 'score')
+        .first()
+    )
+
+
+@receiver(post_save, sender=Reviews)
+def add_score_to_rating(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_rating_state', None)
+    current = (instance.title_id, instance.score)
+
+    if created or previous is None:
+        Titles.objects.update_rating(instance.title_id, instance.score, 1)
+        return
+    if previous == current:
+        return
+
+    previous_title_id, previous_score = previous
+    if previous_title_id == instance.title_id:
+        Titles.objects.update_rating(
+            instance.title_id, instance.score - previous_score, 0
+        )
+        return
+    Titles.objects.update_rating(previous_title_id, -previous_score, -1)
+    Titles.objects.update_rating(instance.title_id, instance.score, 1)
+
+
+@receiver(post_delete, sender=Reviews)
+def remove_score_from_rating(sender, instance, **kwargs):
+    Titles.objects.update_rating(instance.title_id, -instance.score, -1)
+
+
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def touch_review_of_comment(sender, instance, **kwargs):
+    # Creating or deleting a comment marks the comment list of the review
+    # as modified, also when the newest comment goes; edits show up in
+    # the comment's own modified date. post_delete passes no `created`.
+    if kwargs.get('created', True):
+        Reviews.objects.filter(pk=instance.review_id).update(
+            modified=timezone.now()
+        )
+
+
+@receiver(m2m_changed, sender=Titles.genre.through)
+def touch_titles_on_genre_change(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Titles.objects.touch(pk=instance.pk)
+    elif action in ('post_add', 'post_remove'):
+        Titles.objects.touch(pk__in=pk_set)
+    elif action == 'pre_clear':
+        Titles.objects.touch(genre=instance)
+
+
+@receiver(post_save, sender=Categories)
+@receiver(pre_delete, sender=Categories)
+def touch_titles_of_category(sender, instance, **kwargs):
+    if not kwargs.get('created'):
+        Titles.objects.touch(category=instance)
+    # After the commit, so that no page read before it is stored under
+    # the new version.
+    transaction.on_commit(lambda: bump_list_version(sender))
+
+
+@receiver(post_save, sender=Genres)
+@receiver(pre_delete, sender=Genres)
+def touch_titles_of_genre(sender, instance, **kwargs):
+    if not kwargs.get('created'):
+        Titles.objects.touch(genre=instance)
+    transaction.on_commit(lambda: bump_list_version(sender))
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(sender, instance, update_fields=None,
+                               **kwargs):
+    instance._previous_username = None
+    if instance.pk is None:
+        return
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    instance._previous_username = (
+        sender.objects.filter(pk=instance.pk)
+        .values_list('username', flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=User)
+def touch_authored_reviews_and_comments(sender, instance, created, **kwargs):
+    # Reviews and comments show the username of their author, so a rename
+    # must change the ETags and Last-Modified dates of their responses.
+    previous = getattr(instance, '_previous_username', None)
+    if created or previous is None or previous == instance.username:
+        return
+    now = timezone.now()
+    Reviews.objects.filter(author=instance).update(modified=now)
+    Comments.objects.filter(author=instance).update(modified=now)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+    revoke_claims(instance.pk)
@@ -0,0 +1,13 @@
+from django.conf import settings
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """
+    Set `SQLITE_PRAGMAS` on a new SQLite connection. The statements go
+    straight to the driver, so they are neither logged nor counted as
+    queries of the request that opened the connection.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
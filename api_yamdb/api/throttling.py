@@ -1,9 +1,150 @@
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from rest_framework.throttling import ScopedRateThrottle
 
 EMPLOYEES = ('moderator', 'admin')
 
 
+class SQLiteThrottleStorage:
+    """
+    Throttle state kept in an SQLite file, so every worker process on the
+    host sees the same numbers. A hit is one UPSERT statement: SQLite
+    serializes writers, so concurrent updates are never lost, and each
+    key holds a single row.
+    """
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS throttle_counters ('
+        ' key TEXT PRIMARY KEY,'
+        ' period INTEGER NOT NULL,'
+        ' hits INTEGER NOT NULL,'
+        ' expires REAL NOT NULL'
+        ');'
+        'CREATE TABLE IF NOT EXISTS throttle_cells ('
+        ' key TEXT PRIMARY KEY,'
+        ' tat REAL NOT NULL,'
+        ' allowed INTEGER NOT NULL'
+        ');'
+    )
+    INCREMENT = (
+        'INSERT INTO throttle_counters (key, period, hits, expires) '
+        'VALUES (:key, :period, 1, :expires) '
+        'ON CONFLICT (key) DO UPDATE SET '
+        ' hits = CASE WHEN period = excluded.period THEN hits + 1 ELSE 1 END,'
+        ' period = excluded.period,'
+        ' expires = excluded.expires'
+    )
+    # Generic cell rate algorithm: `tat` is the theoretical arrival time
+    # of the next request. A request is allowed while `tat` is at most
+    # `tolerance` seconds ahead of now and then moves it `interval`
+    # seconds further. All SET expressions see the old row.
+    ACQUIRE = (
+        'INSERT INTO throttle_cells (key, tat, allowed) '
+        'VALUES (:key, :now + :interval, 1) '
+        'ON CONFLICT (key) DO UPDATE SET '
+        ' allowed = max(tat, :now) - :now <= :tolerance,'
+        ' tat = CASE WHEN max(tat, :now) - :now <= :tolerance'
+        '  THEN max(tat, :now) + :interval ELSE tat END'
+    )
+    PURGE = (
+        'DELETE FROM throttle_counters WHERE expires < :now',
+        'DELETE FROM throttle_cells WHERE tat < :now',
+    )
+    # Stale rows of idle keys are removed every PURGE_EVERY hits
+    # of a connection.
+    PURGE_EVERY = 1000
+    # UPSERT ... RETURNING needs SQLite 3.35; older versions read the row
+    # back in the same transaction.
+    returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+    def __init__(self, path=None, timeout=5):
+        self.path = path
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def get_connection(self):
+        # A connection must not cross a fork, so it is bound to the process.
+        path = self.path or settings.THROTTLE_DB_PATH
+        if getattr(self.local, 'opened', None) != (os.getpid(), path):
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            connection = sqlite3.connect(
+                path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.executescript(self.SCHEMA)
+            self.local.connection = connection
+            self.local.opened = (os.getpid(), path)
+            self.local.hits = 0
+        return self.local.connection
+
+    def upsert(self, statement, table, columns, params):
+        """Run an UPSERT of `params['key']` and return `columns` of the row."""
+        connection = self.get_connection()
+        self.local.hits += 1
+        if self.local.hits % self.PURGE_EVERY == 0:
+            for purge in self.PURGE:
+                connection.execute(purge, {'now': time.time()})
+        if self.returning:
+            return connection.execute(
+                f'{statement} RETURNING {columns}', params
+            ).fetchone()
+
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            connection.execute(statement, params)
+            row = connection.execute(
+                f'SELECT {columns} FROM {table} WHERE key = :key', params
+            ).fetchone()
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        return row
+
+    def incr(self, key, period, expires):
+        """
+        Count a hit of `key` in window number `period` and return the
+        number of hits in that window.
+        """
+        return self.upsert(self.INCREMENT, 'throttle_counters', 'hits', {
+            'key': key, 'period': period, 'expires': expires,
+        })[0]
+
+    def acquire(self, key, now, interval, tolerance):
+        """
+        Take a slot of `key` at time `now`. Return whether the request is
+        allowed and the theoretical arrival time of the next one.
+        """
+        params = {'key': key, 'now': now, 'interval': interval,
+                  'tolerance': tolerance}
+        tat, allowed = self.upsert(self.ACQUIRE, 'throttle_cells',
+                                   'tat, allowed', params)
+        return bool(allowed), tat
+
+    def clear(self):
+        self.get_connection().executescript(
+            'DELETE FROM throttle_counters;'
+            'DELETE FROM throttle_cells;'
+        )
+
+
+throttle_storage = SQLiteThrottleStorage()
+
+
 class NonEmployeeScopedRateThrottle(ScopedRateThrottle):
+    """
+    Scoped throttle for users who are neither moderators nor admins.
+    Hits are counted in fixed windows of the rate duration in the shared
+    `throttle_storage` instead of the per-process cache.
+    """
+
+    storage = throttle_storage
 
     def get_cache_key(self, request, view):
         if request.user.is_authenticated and request.user.role in EMPLOYEES:
@@ -18,3 +159,78 @@ class NonEmployeeScopedRateThrottle(ScopedRateThrottle):
             'scope': self.scope,
             'ident': ident
         }
+
+    def parse_rate(self, rate):
+        if isinstance(rate, dict):
+            raise ImproperlyConfigured(
+                f'Лимит с пачкой запросов для `{self.scope}` поддерживает '
+                f'только {NonEmployeeBurstRateThrottle.__name__}'
+            )
+        return super().parse_rate(rate)
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        period = int(self.now // self.duration)
+        self.expires = (period + 1) * self.duration
+        self.hits = self.storage.incr(self.key, period, self.expires)
+        return self.hits <= self.num_requests
+
+    def wait(self):
+        return max(self.expires - self.now, 0)
+
+
+class NonEmployeeBurstRateThrottle(NonEmployeeScopedRateThrottle):
+    """
+    Rate throttle for non-employees based on the generic cell rate
+    algorithm, which keeps one arrival time per key. The rate of a scope
+    is either a string like `'60/min'`, allowing up to 60 requests at
+    once, or a dict with the sustained rate and the number of requests
+    allowed in a burst:
+
+        'auth-non-employee': {'sustained': '20/hour', 'burst': 5}
+    """
+
+    def parse_rate(self, rate):
+        if isinstance(rate, dict):
+            num_requests, duration = super().parse_rate(rate['sustained'])
+            return num_requests, duration, int(rate['burst'])
+        num_requests, duration = super().parse_rate(rate)
+        return num_requests, duration, num_requests
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, self.scope_attr, None)
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        num_requests, duration, burst = self.parse_rate(self.rate)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        self.interval = duration / num_requests
+        self.tolerance = (burst - 1) * self.interval
+        allowed, self.tat = self.storage.acquire(
+            self.key, self.now, self.interval, self.tolerance
+        )
+        return allowed
+
+    def wait(self):
+        return max(self.tat - self.now - self.tolerance, 0)
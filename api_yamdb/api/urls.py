@@ -1,10 +1,12 @@
 from rest_framework.routers import DefaultRouter
 
-from django.urls import include, path
+from django.urls import include, path, re_path
 
-from .views import (CategoriesViewSet, CommentsViewSet, GenresViewSet,
-                    ReviewsViewSet, SendConfirmCodeView, TitlesViewSet,
-                    TokenReceiveView, UserMeViewSet, UserViewSet)
+from .export import EXPORTS, FORMATS
+from .views import (CategoriesViewSet, CommentsViewSet, ExportView,
+                    GenresViewSet, ReviewsViewSet, SendConfirmCodeView,
+                    TitlesViewSet, TokenReceiveView, UserMeViewSet,
+                    UserViewSet)
 
 router_v1 = DefaultRouter()
 router_v1.register('users', UserViewSet, basename='user')
@@ -28,5 +30,12 @@ urlpatterns = [
     path('v1/users/me/',
          UserMeViewSet.as_view({'get': 'retrieve', 'patch': 'partial_update'}),
          name='user_me_view_set'),
+    re_path(
+        r'^v1/export/(?P<name>{})\.(?P<file_format>{})$'.format(
+            '|'.join(EXPORTS), '|'.join(FORMATS)
+        ),
+        ExportView.as_view(),
+        name='export'
+    ),
     path('v1/', include(router_v1.urls)),
 ]
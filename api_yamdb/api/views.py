@@ -1,24 +1,36 @@
 import datetime as dt
 
 import jwt
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, status, viewsets
 from rest_framework.generics import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import AccessToken
 
 from django.conf import settings
-from django.core.mail import send_mail
-from django.db.models import Avg, FloatField
-from django.db.models.functions import Round
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.functional import cached_property
 
-from .filters import TitlesFilter
-from .models import Categories, Genres, Titles, User, Reviews
+from .authentication import issue_token
+from .cache import (
+    bump_list_version, get_list_page, get_list_page_key, set_list_page
+)
+from .export import FORMATS, stream_export
+from .filters import TitlesFilter, TitlesSearchFilter
+from .mail import deliver_mail
+from .negotiation import IgnoreClientContentNegotiation
+from .mixins import (
+    BulkCreateMixin, ConditionalGetMixin, SparseFieldsMixin, ValuesListMixin
+)
+from .models import Categories, Comments, Genres, Titles, User, Reviews
+from .pagination import PageNumberOrCursorPagination
 from .permissions import (
     IsAdmin, IsAuthor, IsModerator, IsSafeMethod, HasUsernameForPOST
 )
+from .replicas import use_primary
 from .serializers import (
     CategoriesSerializer, GenresSerializer, SendConfirmCodeSerializer,
     TitlesSafeMethodSerializer, TitlesUnSafeMethodSerializer,
@@ -51,9 +63,8 @@ class SendConfirmCodeView(APIView):
         if serializer.is_valid():
             email = serializer.validated_data.get('email')
             signed_code = self.create_jwt(email)
-            send_mail(subject=MAIL_SUBJECT, from_email=None,
-                      message=signed_code, recipient_list=(email,),
-                      fail_silently=True)
+            deliver_mail(subject=MAIL_SUBJECT, message=signed_code,
+                         recipient=email)
 
             return Response(serializer.validated_data,
                             status=status.HTTP_200_OK)
@@ -72,18 +83,13 @@ class TokenReceiveView(APIView):
                             status=status.HTTP_400_BAD_REQUEST)
 
         email = serializer.validated_data.get('email')
-
-        if User.objects.filter(email=email).exists():
-            user = User.objects.get(email=email)
-        else:
-            user = User.objects.create_user(email=email, role='user')
-
-        access = str(AccessToken.for_user(user))
+        user = User.objects.get_or_create_by_email(email)
+        access = str(issue_token(user))
 
         return Response({'token': access}, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = User.objects.exclude(username__isnull=True)
     serializer_class = UserSerializer
     permission_classes = (IsAdmin,)
@@ -99,45 +105,112 @@ class UserMeViewSet(viewsets.ModelViewSet):
     throttle_scope = 'burst-non-employee'
 
     def get_object(self):
+        # The authenticated user is already loaded; changes are saved
+        # from a fresh row.
+        if self.request.method == 'GET' and isinstance(self.request.user,
+                                                       User):
+            return self.request.user
         user = get_object_or_404(User, pk=self.request.user.id)
         return user
 
 
-class ReviewsViewSet(viewsets.ModelViewSet):
+class ReviewsViewSet(SparseFieldsMixin, ConditionalGetMixin, ValuesListMixin,
+                     viewsets.ModelViewSet):
     serializer_class = ReviewsSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
+    pagination_class = PageNumberOrCursorPagination
     throttle_scope = 'burst-non-employee'
     permission_classes = (
         IsAdmin | IsModerator | IsAuthor | IsSafeMethod, HasUsernameForPOST
     )
 
+    @cached_property
+    def title(self):
+        """
+        The title from the URL, resolved once per request together with
+        the state of its reviews.
+        """
+        return get_object_or_404(
+            Titles.objects.annotate(
+                last_review=Max('reviews__modified'),
+                review_amount=Count('reviews'),
+            ),
+            pk=self.kwargs.get('title_id')
+        )
+
     def get_queryset(self):
-        title = get_object_or_404(Titles, id=self.kwargs.get('title_id'))
-        return title.reviews.all().order_by('-id')
+        queryset = Reviews.objects.filter(
+            title_id=self.kwargs.get('title_id')
+        ).order_by('-id')
+        related = [name for name in ('author', 'title')
+                   if self.wants_field(name)]
+        if related:
+            # Without arguments select_related() would follow every key.
+            queryset = queryset.select_related(*related)
+        return queryset
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Titles, id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+        serializer.save(author=self.request.user, title=self.title)
+
+    def get_list_state(self):
+        title = self.title
+        return title.modified, title.last_review, title.review_amount
+
+    def get_object_state(self):
+        return Reviews.objects.filter(
+            pk=self.kwargs.get('pk'), title_id=self.kwargs.get('title_id')
+        ).values_list('modified', 'title__modified').first()
 
 
-class CommentsViewSet(viewsets.ModelViewSet):
+class CommentsViewSet(ConditionalGetMixin, ValuesListMixin,
+                      viewsets.ModelViewSet):
     serializer_class = CommentsSerializer
     http_method_names = ('get', 'post', 'patch', 'delete')
+    pagination_class = PageNumberOrCursorPagination
     throttle_scope = 'burst-non-employee'
     permission_classes = (
         IsAdmin | IsModerator | IsAuthor | IsSafeMethod, HasUsernameForPOST
     )
 
+    @cached_property
+    def review(self):
+        """
+        The review from the URL, checked to belong to the title from the
+        URL and resolved once per request together with the state of its
+        comments.
+        """
+        return get_object_or_404(
+            Reviews.objects.annotate(
+                last_comment=Max('comments__modified'),
+                comment_amount=Count('comments'),
+            ),
+            pk=self.kwargs.get('review_id'),
+            title_id=self.kwargs.get('title_id')
+        )
+
     def get_queryset(self):
-        review = get_object_or_404(Reviews, id=self.kwargs.get('review_id'))
-        return review.comments.all().order_by('-id')
+        return Comments.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        ).select_related('author').order_by('-id')
 
     def perform_create(self, serializer):
-        review = get_object_or_404(Reviews, id=self.kwargs.get('review_id'))
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.review)
 
+    def get_list_state(self):
+        review = self.review
+        return review.modified, review.last_comment, review.comment_amount
 
-class CreateListDestroyViewSet(mixins.CreateModelMixin,
+    def get_object_state(self):
+        return Comments.objects.filter(
+            pk=self.kwargs.get('pk'),
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        ).values_list('modified').first()
+
+
+class CreateListDestroyViewSet(BulkCreateMixin,
+                               mixins.CreateModelMixin,
                                mixins.ListModelMixin,
                                mixins.DestroyModelMixin,
                                viewsets.GenericViewSet):
@@ -146,6 +219,24 @@ class CreateListDestroyViewSet(mixins.CreateModelMixin,
     search_fields = ('name',)
     lookup_field = 'slug'
 
+    def list(self, request, *args, **kwargs):
+        key = get_list_page_key(self.queryset.model, request)
+        data = get_list_page(key)
+        if data is not None:
+            return Response(data)
+
+        # The page is shared by all clients until the next change: a
+        # replica could store a stale one.
+        with use_primary():
+            response = super().list(request, *args, **kwargs)
+        set_list_page(key, response.data)
+        return response
+
+    def perform_bulk_create(self, serializer):
+        # bulk_create sends no signals to bump the version.
+        super().perform_bulk_create(serializer)
+        bump_list_version(self.queryset.model)
+
 
 class CategoriesViewSet(CreateListDestroyViewSet):
     queryset = Categories.objects.all().order_by('name')
@@ -157,19 +248,47 @@ class GenresViewSet(CreateListDestroyViewSet):
     serializer_class = GenresSerializer
 
 
-class TitlesViewSet(viewsets.ModelViewSet):
-    class RoundTo(Round):
-        arity = 2
-        output_field = FloatField()
-
-    queryset = Titles.objects.annotate(
-        rating=RoundTo(Avg('reviews__score'), 2)
-    ).order_by('-id')
+class TitlesViewSet(BulkCreateMixin, SparseFieldsMixin, ConditionalGetMixin,
+                    ValuesListMixin, viewsets.ModelViewSet):
     permission_classes = (IsAdmin | IsSafeMethod,)
     throttle_scope = 'burst-non-employee'
+    filter_backends = (TitlesSearchFilter, DjangoFilterBackend)
     filterset_class = TitlesFilter
 
+    def get_queryset(self):
+        queryset = Titles.objects.order_by('-id')
+        if self.wants_field('category'):
+            queryset = queryset.select_related('category')
+        if self.wants_field('genre'):
+            queryset = queryset.prefetch_related('genre')
+        return queryset
+
+    def get_object_state(self):
+        return Titles.objects.filter(
+            pk=self.kwargs.get('pk')
+        ).values_list('modified').first()
+
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return TitlesSafeMethodSerializer
         return TitlesUnSafeMethodSerializer
+
+
+class ExportView(APIView):
+    """
+    Stream every title, review or comment as NDJSON or CSV, so that a
+    whole collection takes one request instead of a crawl of its pages.
+    """
+    permission_classes = (IsAdmin,)
+    # The format is part of the URL; errors are still rendered as JSON.
+    content_negotiation_class = IgnoreClientContentNegotiation
+
+    def get(self, request, name, file_format):
+        content_type, _ = FORMATS[file_format]
+        response = StreamingHttpResponse(
+            stream_export(name, file_format), content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{name}.{file_format}"'
+        )
+        return response
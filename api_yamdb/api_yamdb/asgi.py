@@ -1,7 +1,15 @@
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from asgiref.wsgi import WsgiToAsgi
+from django.core.handlers.wsgi import WSGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+from api.asgi import CatalogReadApplication  # noqa: E402
+
+# Django 2.2 has no ASGI handler: everything but the catalog reads goes
+# to the WSGI application through asgiref's adapter.
+application = CatalogReadApplication(WsgiToAsgi(WSGIHandler()))
@@ -26,6 +26,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestMetricsMiddleware',
+    'api.middleware.ReplicaPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,9 +63,38 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        # Worker threads keep their connection between requests.
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
     }
 }
 
+# Read replicas of the primary, as comma separated SQLite file paths in
+# DB_REPLICAS. They are refreshed by the sync_replicas command.
+for number, path in enumerate(
+        filter(None, os.environ.get('DB_REPLICAS', '').split(',')), start=1):
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'], 'NAME': path, 'TEST': {'MIRROR': 'default'}
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['api.replicas.ReplicaRouter']
+# Requests read from the primary for this long after writing; should be
+# longer than the replica lag, e.g. the sync_replicas interval.
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', 15))
+
+# Applied to every new SQLite connection by api.sqlite.apply_pragmas.
+# WAL lets readers go on while a review is being written; with it
+# synchronous=NORMAL is still safe against corruption and only loses the
+# last transactions on a power failure.
+SQLITE_PRAGMAS = {
+    # First, so that switching the journal mode waits for other writers.
+    'busy_timeout': 5000,
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    # Negative values are in KiB: 64 MiB of page cache per connection.
+    'cache_size': -64 * 1024,
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -98,7 +129,19 @@ REST_FRAMEWORK = {
         'api.permissions.IsAdmin',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.ClaimsJWTAuthentication',
+    ],
+    # api.renderers and api.parsers encode and decode JSON with orjson when
+    # it is installed; rest_framework.renderers.JSONRenderer and
+    # rest_framework.parsers.JSONParser give the same results.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_FILTER_BACKENDS': [
         'rest_framework.filters.SearchFilter',
@@ -107,6 +150,8 @@ REST_FRAMEWORK = {
     'DEFAULT_THROTTLE_CLASSES': [
         'api.throttling.NonEmployeeScopedRateThrottle',
     ],
+    # api.throttling.NonEmployeeBurstRateThrottle also accepts
+    # {'sustained': '20/hour', 'burst': 5}.
     'DEFAULT_THROTTLE_RATES': {
         'auth-non-employee': '20/hour',
         'burst-non-employee': '60/min',
@@ -123,8 +168,69 @@ SIMPLE_JWT = {
 
 AUTH_USER_MODEL = 'api.User'
 
+# Users authenticated by api.authentication.CachedJWTAuthentication are
+# kept in a per-process LRU cache, optionally also in the default cache.
+AUTH_USER_CACHE_SIZE = 1024
+AUTH_USER_CACHE_TIMEOUT = 60
+AUTH_USER_CACHE_SHARED = False
+
+# Tokens issued with role and username claims let safe-method requests
+# skip loading the user while the claims are younger than
+# AUTH_CLAIMS_LIFETIME. Changing a user revokes the claims through the
+# default cache, which has to be shared between the workers: startup
+# fails with a per-process cache, see api.authentication.
+AUTH_CLAIMS_TOKENS = os.environ.get('AUTH_CLAIMS_TOKENS', '') == 'on'
+AUTH_CLAIMS_LIFETIME = timedelta(minutes=15)
+
+# Shared by all worker processes of the host, see api.throttling.
+THROTTLE_DB_PATH = os.environ.get(
+    'THROTTLE_DB_PATH', os.path.join(BASE_DIR, 'tmp/throttle.sqlite3')
+)
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'tmp/test-sent-mail')
 
+# 'direct' sends mail during the request, 'queued' leaves it for the
+# send_queued_mail command.
+EMAIL_DELIVERY = os.environ.get('EMAIL_DELIVERY', 'direct')
+
 EMAIL_EXPIRATION_TIME = timedelta(hours=100)
 DEFAULT_FROM_EMAIL = 'api@yatube.com'
+
+# Largest JSON array accepted by POST of titles, genres and categories.
+BULK_CREATE_LIMIT = 1000
+
+# List pages and their versions, revoked token claims and replica pins
+# must be seen by every worker process, so the default cache is a
+# directory shared by the processes of the host, not the per-process
+# memory cache Django falls back to.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'CACHE_LOCATION', os.path.join(BASE_DIR, 'tmp/cache')
+        ),
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+
+LIST_CACHE_TIMEOUT = 60 * 15
+
+CATALOG_READ_THREADS = int(os.environ.get('CATALOG_READ_THREADS', 16))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.metrics': {
+            'handlers': ['console'],
+            'level': os.environ.get('METRICS_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
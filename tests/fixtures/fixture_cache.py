@@ -0,0 +1,34 @@
+import pytest
+
+
+@pytest.fixture(scope='session', autouse=True)
+def cache_location(tmp_path_factory):
+    # The shared file cache of the tests lives apart from the real one.
+    from django.conf import settings
+
+    settings.CACHES['default']['LOCATION'] = str(tmp_path_factory.mktemp('cache'))
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_throttle(settings, tmp_path_factory):
+    # Every test counts in a new file, never in the real THROTTLE_DB_PATH.
+    path = tmp_path_factory.mktemp('throttle') / 'throttle.sqlite3'
+    settings.THROTTLE_DB_PATH = str(path)
+
+
+@pytest.fixture(autouse=True)
+def clear_user_cache():
+    from api.authentication import user_cache
+
+    user_cache.clear()
+    yield
+    user_cache.clear()
@@ -0,0 +1,29 @@
+import pytest
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix,
+                                 tmp_path_factory):
+    # A file database, unlike the in-memory one, lets concurrent threads
+    # wait for each other's write locks instead of failing.
+    from django.conf import settings
+
+    path = tmp_path_factory.mktemp('database') / 'db.sqlite3'
+    settings.DATABASES['default']['TEST']['NAME'] = str(path)
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    # A read replica in a file of its own, refreshed by sync_replicas().
+    from django.db import connections
+
+    alias = 'replica_1'
+    connections.databases[alias] = {
+        **connections.databases['default'],
+        'NAME': str(tmp_path / 'replica.sqlite3'),
+    }
+    settings.DATABASE_REPLICAS = [alias]
+    yield alias
+    connections[alias].close()
+    delattr(connections._connections, alias)
+    del connections.databases[alias]
@@ -346,3 +346,15 @@ class Test01UserAPI:
         assert test_moderator.first_name == 'NewTest', (
             'Проверьте, что при PATCH запросе `/api/v1/users/me/` изменяете данные'
         )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_12_users_sparse_fields(self, user_client, admin):
+        response = user_client.get('/api/v1/users/', {'fields': 'username,role'})
+        assert response.status_code == 200
+        assert response.json()['results'] == [{'username': admin.username, 'role': 'admin'}], (
+            'Проверьте, что параметр `fields` оставляет в ответе только перечисленные поля'
+        )
+        response = user_client.patch(f'/api/v1/users/{admin.username}/?fields=role', data={'bio': 'bio'})
+        assert response.status_code == 200 and response.json()['bio'] == 'bio', (
+            'Проверьте, что параметр `fields` не влияет на изменяющие запросы'
+        )
@@ -1,8 +1,16 @@
+from unittest import mock
+
 import pytest
 
 from .common import auth_client, create_categories, create_users_api
 
 
+def bump_categories():
+    from api.cache import bump_list_version
+    from api.models import Categories
+
+    bump_list_version(Categories)
+
 class Test02CategoryAPI:
 
     @pytest.mark.django_db(transaction=True)
@@ -147,3 +155,86 @@ class Test02CategoryAPI:
         user, moderator = create_users_api(user_client)
         self.check_permissions(user, 'обычного пользователя', categories)
         self.check_permissions(moderator, 'модератора', categories)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_category_list_cache(self, client, user_client, django_assert_num_queries):
+        create_categories(user_client)
+        response = client.get('/api/v1/categories/?search=Фильм')
+        assert len(response.json()['results']) == 1
+        with django_assert_num_queries(0):
+            cached = client.get('/api/v1/categories/?search=Фильм')
+        assert cached.json() == response.json(), (
+            'Проверьте, что повторный GET запрос `/api/v1/categories/` отдаёт сохранённую страницу'
+        )
+
+        user_client.delete('/api/v1/categories/films/')
+        response = client.get('/api/v1/categories/?search=Фильм')
+        assert response.json()['count'] == 0, (
+            'Проверьте, что после DELETE запроса `/api/v1/categories/{slug}/` список категорий обновляется'
+        )
+        user_client.post('/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'})
+        response = client.get('/api/v1/categories/?search=Фильм')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что после POST запроса `/api/v1/categories/` список категорий обновляется'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_category_bulk_create(self, client, user_client):
+        data = [{'name': f'Категория {number}', 'slug': f'category-{number}'} for number in range(5)]
+        response = user_client.post('/api/v1/categories/', data=data, format='json')
+        assert response.status_code == 201, (
+            'Проверьте, что при POST запросе `/api/v1/categories/` со списком объектов возвращается статус 201'
+        )
+        assert response.json() == data
+        assert client.get('/api/v1/categories/').json()['count'] == 5
+
+        response = user_client.post('/api/v1/categories/', data=[
+            {'name': 'Новая', 'slug': 'category-0'},
+            {'name': 'Повтор', 'slug': 'new'},
+            {'name': 'Повтор', 'slug': 'new-2'},
+        ], format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert list(errors[0]) == ['slug'] and list(errors[1]) == ['name'] and list(errors[2]) == ['name'], (
+            'Проверьте, что уникальность полей проверяется для всего списка'
+        )
+        assert client.get('/api/v1/categories/').json()['count'] == 5
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_category_list_cache_race(self, client, user_client):
+        from rest_framework.mixins import ListModelMixin
+
+        from api.cache import bump_list_version
+        from api.models import Categories
+
+        create_categories(user_client)
+        list_page = ListModelMixin.list
+
+        def list_then_create(view, request, *args, **kwargs):
+            response = list_page(view, request, *args, **kwargs)
+            Categories.objects.create(name='Музыка', slug='music')
+            bump_list_version(Categories)
+            return response
+
+        with mock.patch.object(ListModelMixin, 'list', list_then_create):
+            assert client.get('/api/v1/categories/').json()['count'] == 2
+        assert client.get('/api/v1/categories/').json()['count'] == 3, (
+            'Проверьте, что страница, прочитанная до изменения, не сохраняется под новой версией списка'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_08_category_list_cache_shared(self, client, user_client):
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_context
+
+        from api.models import Categories
+
+        create_categories(user_client)
+        assert client.get('/api/v1/categories/?search=Фильм').json()['count'] == 1
+        # A change bumped in another worker process.
+        Categories.objects.filter(slug='films').update(name='Кино')
+        with ProcessPoolExecutor(1, mp_context=get_context('fork')) as pool:
+            pool.submit(bump_categories).result()
+        assert client.get('/api/v1/categories/?search=Фильм').json()['count'] == 0, (
+            'Проверьте, что изменение в одном процессе сбрасывает страницы, сохранённые другими'
+        )
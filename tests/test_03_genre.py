@@ -138,3 +138,22 @@ class Test03GenreAPI:
         user, moderator = create_users_api(user_client)
         self.check_permissions(user, 'обычного пользователя', genres)
         self.check_permissions(moderator, 'модератора', genres)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_genres_list_cache_model_changes(self, client, user_client):
+        from api.models import Genres
+
+        create_genre(user_client)
+        url = '/api/v1/genres/?search=Драма'
+        assert client.get(url).json()['count'] == 1
+
+        genre = Genres.objects.get(slug='drama')
+        genre.name = 'Трагедия'
+        genre.save()
+        assert client.get(url).json()['count'] == 0, (
+            'Проверьте, что изменение жанра вне API, например в админке, сбрасывает сохранённые страницы'
+        )
+        Genres.objects.create(name='Драма', slug='new-drama')
+        assert client.get(url).json()['count'] == 1
+        Genres.objects.get(slug='new-drama').delete()
+        assert client.get(url).json()['count'] == 0
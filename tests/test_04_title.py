@@ -1,4 +1,7 @@
+from unittest import mock
+
 import pytest
+from rest_framework.pagination import PageNumberPagination
 
 from .common import (auth_client, create_categories, create_genre,
                      create_titles, create_users_api)
@@ -239,3 +242,157 @@ class Test04TitleAPI:
         user, moderator = create_users_api(user_client)
         self.check_permissions(user, 'обычного пользователя', titles, categories, genres)
         self.check_permissions(moderator, 'модератора', titles, categories, genres)
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('amount', (2, 5, 10, 25))
+    def test_05_titles_list_num_queries(self, client, user_client, django_assert_num_queries, amount):
+        from api.models import Genres, Titles
+
+        titles, _, genres = create_titles(user_client)
+        for number in range(amount - len(titles)):
+            title = Titles.objects.create(name=f'Произведение {number}', year=2000,
+                                          description='', category_id=None)
+            title.genre.set(Genres.objects.filter(slug=genres[number % len(genres)]['slug']))
+
+        # COUNT for pagination, titles joined with categories, genres prefetch
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert len(response.json()['results']) == min(amount, 10), (
+            'Проверьте, что при GET запросе `/api/v1/titles/` возвращаются данные с пагинацией'
+        )
+
+        # The same three queries whatever the number of titles on the page
+        for page_size in (1, amount):
+            with mock.patch.object(PageNumberPagination, 'page_size', page_size), \
+                    django_assert_num_queries(3):
+                response = client.get('/api/v1/titles/')
+            assert len(response.json()['results']) == page_size, (
+                'Проверьте, что число запросов к базе не зависит от размера страницы'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_titles_search(self, client):
+        from api.models import Titles
+
+        for name in ('Побег из Шоушенка', 'Крестный отец', 'ОТЕЦ Горио'):
+            Titles.objects.create(name=name, year=1994, description='')
+        title = Titles.objects.get(name='Крестный отец')
+        title.name = 'Крёстный Отец'
+        title.save()
+
+        for query, expected in (('шоушенк', 1), ('ОТЕЦ', 2), ('ёс', 1), ('ИЗ', 1), ('"', 0)):
+            for param in ('name', 'search'):
+                response = client.get('/api/v1/titles/', data={param: query})
+                assert response.status_code == 200
+                assert response.json()['count'] == expected, (
+                    f'Проверьте, что GET запрос `/api/v1/titles/?{param}={query}` '
+                    'ищет по части названия без учёта регистра'
+                )
+
+        title.delete()
+        response = client.get('/api/v1/titles/', data={'name': 'отец'})
+        assert response.json()['count'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_titles_request_metrics(self, client, user_client, caplog):
+        create_titles(user_client)
+        with caplog.at_level('INFO', logger='api.metrics'):
+            response = client.get('/api/v1/titles/')
+        assert response['X-Query-Count'] == '3', (
+            'Проверьте, что в заголовке `X-Query-Count` передаётся количество SQL-запросов'
+        )
+        timings = {part.split(';')[0] for part in response['Server-Timing'].split(', ')}
+        assert timings == {'db', 'serializer', 'view', 'render', 'total'}, (
+            'Проверьте, что в заголовке `Server-Timing` передаются замеры времени запроса'
+        )
+        assert '"queries": 3' in caplog.records[-1].getMessage()
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('amount', (1, 20))
+    def test_08_titles_bulk_create(self, client, user_client, django_assert_max_num_queries, amount):
+        from api.models import Titles
+
+        genres = create_genre(user_client)
+        categories = create_categories(user_client)
+        data = [
+            {'name': f'Произведение {number}', 'year': 2000 + number, 'description': f'Описание {number}',
+             'genre': [genres[number % 3]['slug'], genres[(number + 1) % 3]['slug']],
+             'category': categories[number % 2]['slug']}
+            for number in range(amount)
+        ]
+        # genres, categories, BEGIN, INSERT titles, MAX(id), INSERT relations, genres prefetch
+        with django_assert_max_num_queries(7):
+            response = user_client.post('/api/v1/titles/', data=data, format='json')
+        assert response.status_code == 201, (
+            'Проверьте, что при POST запросе `/api/v1/titles/` со списком объектов возвращается статус 201'
+        )
+        result = response.json()
+        assert [item['name'] for item in result] == [item['name'] for item in data]
+        assert [sorted(item['genre']) for item in result] == [sorted(item['genre']) for item in data]
+        for item in result:
+            title = Titles.objects.get(pk=item['id'])
+            assert title.name == item['name'] and title.category.slug == item['category']
+            assert sorted(title.genre.values_list('slug', flat=True)) == sorted(item['genre'])
+        assert client.get('/api/v1/titles/', {'name': 'Произведение'}).json()['count'] == amount, (
+            'Проверьте, что созданные списком произведения находятся поиском'
+        )
+
+        data = [
+            {'name': 'Верное', 'year': 2000, 'genre': [genres[0]['slug']], 'description': 'Да'},
+            {'name': 'С ошибкой', 'year': 2000, 'genre': ['unknown'], 'description': 'Нет'},
+        ]
+        response = user_client.post('/api/v1/titles/', data=data, format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {} and 'genre' in errors[1], (
+            'Проверьте, что ошибки возвращаются для каждого объекта списка'
+        )
+        assert Titles.objects.count() == amount, (
+            'Проверьте, что при ошибке в списке не создаётся ни один объект'
+        )
+
+        response = client.post('/api/v1/titles/', data=data[:1], content_type='application/json')
+        assert response.status_code == 401
+
+    @pytest.mark.django_db(transaction=True)
+    def test_09_titles_sparse_fields(self, client, user_client, django_assert_num_queries):
+        titles, _, _ = create_titles(user_client)
+
+        # COUNT for pagination and titles, without categories and genres
+        with django_assert_num_queries(2):
+            response = client.get('/api/v1/titles/', {'fields': 'id,name,rating'})
+        assert response.status_code == 200
+        assert response.json()['results'][0] == {
+            'id': titles[1]['id'], 'name': titles[1]['name'], 'rating': None
+        }, 'Проверьте, что параметр `fields` оставляет в ответе только перечисленные поля'
+
+        with django_assert_num_queries(2):
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/', {'exclude': 'genre,description'})
+        assert set(response.json()) == {'id', 'name', 'year', 'category', 'rating'}, (
+            'Проверьте, что параметр `exclude` убирает перечисленные поля из ответа'
+        )
+
+        response = client.get('/api/v1/titles/', {'fields': 'id,unknown'})
+        assert response.status_code == 400 and 'fields' in response.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_10_titles_list_from_rows(self, client, user_client, monkeypatch):
+        from api.mixins import ValuesListMixin
+
+        titles, _, _ = create_titles(user_client)
+        user_client.post('/api/v1/titles/', data={'name': 'Без категории', 'year': 1999, 'description': 'Пусто'})
+        user_client.post(f'/api/v1/titles/{titles[0]["id"]}/reviews/', data={'text': 'Хорошо', 'score': 7})
+        queries = (
+            {}, {'cursor': ''}, {'page': 1}, {'genre': 'drama'}, {'name': 'проект'},
+            {'fields': 'id,genre,rating'}, {'exclude': 'category'},
+        )
+        responses = [client.get('/api/v1/titles/', query) for query in queries]
+
+        monkeypatch.setattr(ValuesListMixin, 'get_projection', lambda self: None)
+        for query, response in zip(queries, responses):
+            assert response.status_code == 200
+            assert response.content == client.get('/api/v1/titles/', query).content, (
+                f'Проверьте, что список произведений с параметрами {query} из строк `values()` '
+                'совпадает побайтно с ответом сериализатора'
+            )
@@ -1,7 +1,10 @@
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
 
-from .common import (auth_client, create_reviews, create_titles,
-                     create_users_api)
+from .common import (auth_client, create_comments, create_reviews,
+                     create_titles, create_users_api)
 
 
 class Test05ReviewAPI:
@@ -289,3 +292,170 @@ class Test05ReviewAPI:
             'без токена авторизации возвращается статус 401'
         )
         self.check_permissions(user, 'обычного пользователя', reviews, titles)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_review_rating_aggregates(self, user_client, admin):
+        from api.models import Titles
+
+        reviews, titles, user, moderator = create_reviews(user_client, admin)
+        title = Titles.objects.get(pk=titles[0]['id'])
+        assert (title.score_sum, title.review_count, title.rating) == (12, 3, 4), (
+            'Проверьте, что рейтинг произведения сохраняется при создании отзывов'
+        )
+
+        user.delete()
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count, title.rating) == (9, 2, 4.5), (
+            'Проверьте, что рейтинг произведения пересчитывается при каскадном удалении отзывов'
+        )
+
+        response = user_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/')
+        assert response.status_code == 204
+        response = user_client.delete(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[2]["id"]}/')
+        assert response.status_code == 204
+        response = user_client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.json().get('rating') is None, (
+            'Проверьте, что после удаления всех отзывов `rating` равен `None`'
+        )
+
+        response = user_client.post(f'/api/v1/titles/{titles[0]["id"]}/reviews/', data={'text': 'a', 'score': 3})
+        assert response.status_code == 201
+        Titles.objects.update(score_sum=0, review_count=0, rating=None)
+        call_command('rebuild_ratings', stdout=StringIO())
+        title.refresh_from_db()
+        assert (title.score_sum, title.review_count, title.rating) == (3, 1, 3), (
+            'Проверьте, что команда `rebuild_ratings` восстанавливает рейтинг произведений'
+        )
+
+        stale = Titles.objects.get(pk=titles[1]['id'])
+        response = user_client.post(f'/api/v1/titles/{titles[1]["id"]}/reviews/', data={'text': 'a', 'score': 8})
+        assert response.status_code == 201
+        stale.description = 'Изменено'
+        stale.save()
+        stale.refresh_from_db()
+        assert (stale.description, stale.score_sum, stale.review_count, stale.rating) == ('Изменено', 8, 1, 8), (
+            'Проверьте, что сохранение произведения не перезаписывает рейтинг, изменённый отзывом'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_reviews_cursor_pagination(self, client, user_client, django_user_model):
+        from api.models import Reviews
+
+        titles, _, _ = create_titles(user_client)
+        for number in range(12):
+            author = django_user_model.objects.create_user(
+                email=f'reviewer{number}@yamdb.fake', username=f'reviewer{number}', role='user'
+            )
+            Reviews.objects.create(author=author, title_id=titles[0]['id'], text=f'{number}', score=5)
+        expected = list(Reviews.objects.order_by('-id').values_list('id', flat=True))
+
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=')
+        assert response.status_code == 200
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/reviews/?cursor=` '
+            'не выполняется подсчёт всех отзывов'
+        )
+        received = [review['id'] for review in data['results']]
+        response = client.get(data['next'])
+        data = response.json()
+        received += [review['id'] for review in data['results']]
+        assert received == expected, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/reviews/?cursor=` '
+            'отзывы возвращаются постранично в порядке убывания `id`'
+        )
+        assert data['next'] is None and data['previous'] is not None
+
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/?page=2')
+        data = response.json()
+        assert data['count'] == 12 and len(data['results']) == 2, (
+            'Проверьте, что постраничный вывод по номеру страницы продолжает работать'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_reviews_conditional_get(self, client, user_client, admin):
+        reviews, titles, user, moderator = create_reviews(user_client, admin)
+        urls = (
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+        )
+        etags = {}
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == 200
+            assert response.has_header('ETag') and response.has_header('Last-Modified'), (
+                f'Проверьте, что при GET запросе `{url}` возвращаются заголовки `ETag` и `Last-Modified`'
+            )
+            etags[url] = response['ETag']
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == 304, (
+                f'Проверьте, что при GET запросе `{url}` с актуальным `If-None-Match` возвращается статус 304'
+            )
+
+        client_user = auth_client(user)
+        client_user.patch(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/', data={'score': 9})
+        for url in urls:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == 200, (
+                f'Проверьте, что после изменения отзыва GET запрос `{url}` возвращает новые данные'
+            )
+            assert response['ETag'] != etags[url]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_08_reviews_list_num_queries(self, client, user_client, django_user_model,
+                                         django_assert_num_queries):
+        from api.models import Reviews
+
+        titles, _, _ = create_titles(user_client)
+        for number in range(10):
+            author = django_user_model.objects.create_user(
+                email=f'reviewer{number}@yamdb.fake', username=f'reviewer{number}', role='user'
+            )
+            Reviews.objects.create(author=author, title_id=titles[0]['id'], text=f'{number}', score=5)
+
+        # title with the state of its reviews, COUNT for pagination, reviews joined with authors
+        with django_assert_num_queries(3):
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert len(response.json()['results']) == 10
+        assert response.json()['results'][0]['title'] == titles[0]['name']
+
+        response = client.get('/api/v1/titles/999/reviews/')
+        assert response.status_code == 404, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/reviews/` '
+            'для несуществующего произведения возвращается статус 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_09_reviews_sparse_fields(self, client, user_client, admin, django_assert_num_queries):
+        reviews, titles, _, _ = create_reviews(user_client, admin)
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with django_assert_num_queries(3) as context:
+            response = client.get(url, {'fields': 'id,score'})
+        assert all(set(review) == {'id', 'score'} for review in response.json()['results']), (
+            'Проверьте, что параметр `fields` оставляет в ответе только перечисленные поля'
+        )
+        assert 'JOIN' not in context.captured_queries[-1]['sql'], (
+            'Проверьте, что для невыбранных полей не выполняется JOIN'
+        )
+        response = client.get(url, {'exclude': 'title'})
+        assert all('title' not in review and 'author' in review for review in response.json()['results'])
+
+    @pytest.mark.django_db(transaction=True)
+    def test_10_reviews_conditional_get_author_renamed(self, client, user_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(user_client, admin)
+        urls = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[1]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/',
+        )
+        etags = {url: client.get(url)['ETag'] for url in urls}
+
+        response = auth_client(user).patch('/api/v1/users/me/', data={'username': 'renamed'})
+        assert response.status_code == 200
+        for url in urls:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == 200 and 'renamed' in response.content.decode(), (
+                f'Проверьте, что после смены имени автора GET запрос `{url}` возвращает новые данные'
+            )
@@ -246,3 +246,93 @@ class Test06CommentAPI:
             'без токена авторизации возвращается статус 401'
         )
         self.check_permissions(user, 'обычного пользователя', f'{pre_url}{comments[2]["id"]}/')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_comments_conditional_get(self, client, user_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        response = client.get(url)
+        etag = response['ETag']
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что при GET запросе `/api/v1/titles/{title_id}/reviews/{review_id}/comments/` '
+            'с актуальным `If-None-Match` возвращается статус 304'
+        )
+        user_client.delete(f'{url}{comments[0]["id"]}/')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после удаления комментария GET запрос '
+            '`/api/v1/titles/{title_id}/reviews/{review_id}/comments/` возвращает новые данные'
+        )
+        response = client.get(f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/',
+                              HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code != 304
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_comments_check_url_chain(self, client, user_client, admin):
+        comments, reviews, titles, user, moderator = create_comments(user_client, admin)
+        urls = (
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/',
+            f'/api/v1/titles/{titles[1]["id"]}/reviews/{reviews[0]["id"]}/comments/{comments[0]["id"]}/',
+        )
+        for url in urls:
+            response = client.get(url)
+            assert response.status_code == 404, (
+                f'Проверьте, что при GET запросе `{url}` для отзыва к другому произведению '
+                'возвращается статус 404'
+            )
+        response = user_client.post(urls[0], data={'text': 'qwerty'})
+        assert response.status_code == 404, (
+            'Проверьте, что при POST запросе `/api/v1/titles/{title_id}/reviews/{review_id}/comments/` '
+            'для отзыва к другому произведению возвращается статус 404'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_reviews_and_comments_list_from_rows(self, client, user_client, admin, monkeypatch):
+        from api.mixins import ValuesListMixin
+
+        comments, reviews, titles, user, moderator = create_comments(user_client, admin)
+        reviews_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        comments_url = f'{reviews_url}{reviews[0]["id"]}/comments/'
+        requests = (
+            (reviews_url, {}), (reviews_url, {'cursor': ''}), (reviews_url, {'fields': 'id,author'}),
+            (comments_url, {}), (comments_url, {'cursor': ''}),
+        )
+        responses = [client.get(url, query) for url, query in requests]
+
+        monkeypatch.setattr(ValuesListMixin, 'get_projection', lambda self: None)
+        for (url, query), response in zip(requests, responses):
+            assert response.status_code == 200
+            assert response.content == client.get(url, query).content, (
+                f'Проверьте, что список `{url}` с параметрами {query} из строк `values()` '
+                'совпадает побайтно с ответом сериализатора'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_08_comments_if_modified_since(self, client, user_client, admin):
+        import datetime as dt
+
+        from api.models import Comments, Reviews
+
+        comments, reviews, titles, user, moderator = create_comments(user_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/'
+        past = dt.datetime(2021, 1, 1, tzinfo=dt.timezone.utc)
+        Comments.objects.update(modified=past)
+        Reviews.objects.update(modified=past)
+
+        last_modified = client.get(url)['Last-Modified']
+        assert client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+        user_client.delete(f'{url}{comments[-1]["id"]}/')
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 200, (
+            'Проверьте, что после удаления последнего комментария запрос с `If-Modified-Since` '
+            'возвращает новые данные'
+        )
+
+        # A change in the same second as the previous response
+        last_modified = response['Last-Modified']
+        user_client.patch(f'{url}{comments[0]["id"]}/', data={'text': 'Изменён'})
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 200 and response.json()['results'][-1]['text'] == 'Изменён', (
+            'Проверьте, что изменение в ту же секунду не скрывается ответом 304'
+        )
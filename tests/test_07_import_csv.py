@@ -0,0 +1,40 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+class Test07ImportCSV:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_import_csv(self, client):
+        from api.models import Comments, Reviews, Titles, User
+
+        assert client.get('/api/v1/genres/').json()['count'] == 0
+        call_command('import_csv', batch_size=10, stdout=StringIO())
+        assert client.get('/api/v1/genres/').json()['count'] > 0, (
+            'Проверьте, что после `import_csv` сохранённые страницы списка жанров сбрасываются'
+        )
+        assert Titles.objects.count() == 32, (
+            'Проверьте, что команда `import_csv` загружает произведения из `data/titles.csv`'
+        )
+        assert User.objects.get(username='capt_obvious').pk == 101, (
+            'Проверьте, что команда `import_csv` сохраняет `id` пользователей'
+        )
+        assert Titles.objects.get(pk=1).genre.count() == 1
+        assert Comments.objects.count() == 5
+        review = Reviews.objects.get(pk=1)
+        assert (review.pub_date.year, review.pub_date.month) == (2019, 9), (
+            'Проверьте, что команда `import_csv` сохраняет дату публикации отзыва'
+        )
+
+        response = client.get('/api/v1/titles/1/')
+        assert response.json()['rating'] == 10, (
+            'Проверьте, что после загрузки отзывов рейтинг произведений пересчитан'
+        )
+
+        reviews = Reviews.objects.count()
+        call_command('import_csv', stdout=StringIO())
+        assert Reviews.objects.count() == reviews, (
+            'Проверьте, что повторный запуск `import_csv` не дублирует строки'
+        )
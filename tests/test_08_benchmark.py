@@ -0,0 +1,64 @@
+import pytest
+
+
+class Test08Benchmark:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('server', (False, True))
+    def test_01_benchmark_endpoints(self, server):
+        from api.benchmarks.dataset import seed
+        from api.benchmarks.http import run_benchmark
+
+        refs = seed(titles=5, reviews_per_title=2, comments_per_review=1, genres=3, categories=2)
+        report = run_benchmark(refs, requests=3, concurrency=1, server=server)
+
+        endpoints = report['endpoints']
+        assert 'GET /api/v1/titles/' in endpoints
+        assert f'GET /api/v1/titles/?name={refs["search"]}' in endpoints
+        for name, result in endpoints.items():
+            assert result['requests'] == 3
+            assert result['errors'] == 0, f'{name}: {result["statuses"]}'
+            assert set(result['latency_ms']) == {'mean', 'p50', 'p95', 'p99'}
+            assert result['queries_per_request'] is not None
+        assert endpoints['GET /api/v1/titles/']['queries_per_request'] == 3
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_benchmark_rendering(self):
+        from api.benchmarks.dataset import seed
+        from api.benchmarks.rendering import run_rendering_benchmark
+
+        seed(titles=5, reviews_per_title=2, comments_per_review=1, genres=3, categories=2)
+        report = run_rendering_benchmark(page_size=5, repeat=2)
+
+        assert set(report['pages']) == {'titles', 'reviews', 'comments'}
+        for result in report['pages'].values():
+            assert result['bytes'] > 0
+            assert result['render_fast_us'] > 0 and result['parse_fast_us'] > 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_benchmark_serialization(self):
+        from api.benchmarks.dataset import seed
+        from api.benchmarks.serialization import run_serialization_benchmark
+
+        seed(titles=5, reviews_per_title=2, comments_per_review=1, genres=3, categories=2)
+        report = run_serialization_benchmark(page_size=5, repeat=2)
+
+        assert set(report['pages']) == {'titles', 'reviews', 'comments'}
+        for result in report['pages'].values():
+            assert result['rows'] == 5
+            assert result['instances_per_second'] > 0 and result['rows_per_second'] > 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_benchmark_sqlite(self):
+        from api.benchmarks.dataset import seed
+        from api.benchmarks.sqlite import run_sqlite_benchmark
+
+        refs = seed(titles=20, reviews_per_title=2, comments_per_review=0, genres=3, categories=2)
+        report = run_sqlite_benchmark(refs, titles=20, duration=0.3, readers=2, writers=1)
+
+        assert set(report['results']) == {'default', 'tuned'}
+        for result in report['results'].values():
+            for kind in ('reads', 'writes'):
+                assert result[kind]['errors'] == 0
+                assert result[kind]['requests'] > 0
+        assert set(report['speedup']) == {'reads', 'writes'}
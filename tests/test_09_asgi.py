@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import pytest
+
+from .common import create_titles
+
+
+async def call(application, path, method='GET', query_string=b''):
+    messages = []
+    requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+    async def receive():
+        return requests.pop(0) if requests else {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': query_string,
+        'headers': [(b'host', b'testserver')], 'server': ('testserver', 80),
+        'client': ('127.0.0.1', 5000), 'scheme': 'http', 'http_version': '1.1',
+    }
+    await application(scope, receive, send)
+    return messages
+
+
+async def fallback(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 418, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+class Test09ASGI:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_catalog_reads(self, user_client):
+        from api.asgi import CatalogReadApplication
+
+        titles, _, _ = create_titles(user_client)
+        application = CatalogReadApplication(fallback, max_workers=2)
+
+        async def run():
+            return await asyncio.gather(
+                call(application, '/api/v1/titles/'),
+                call(application, f'/api/v1/titles/{titles[0]["id"]}/'),
+                call(application, '/api/v1/titles/', query_string='name=поворот'.encode()),
+                call(application, '/api/v1/genres/'),
+                call(application, f'/api/v1/titles/{titles[0]["id"]}/reviews/'),
+                call(application, '/api/v1/categories/', method='HEAD'),
+                call(application, '/api/v1/users/'),
+                call(application, '/api/v1/titles/', method='POST'),
+            )
+
+        responses = asyncio.run(run())
+        for messages in responses[:5]:
+            assert messages[0]['status'] == 200
+            assert (b'content-type', b'application/json') in messages[0]['headers']
+        assert json.loads(responses[0][1]['body'])['count'] == 2
+        assert json.loads(responses[1][1]['body'])['name'] == titles[0]['name']
+        assert json.loads(responses[2][1]['body'])['count'] == 1
+        assert responses[5][0]['status'] == 200 and responses[5][1]['body'] == b''
+        assert responses[6][0]['status'] == 418, 'Запросы вне каталога передаются основному приложению'
+        assert responses[7][0]['status'] == 418
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_project_application(self, user_client):
+        from api_yamdb.asgi import application
+
+        titles, _, _ = create_titles(user_client)
+
+        async def run():
+            return await asyncio.gather(
+                call(application, '/api/v1/titles/'),
+                call(application, '/api/v1/users/'),
+                call(application, f'/api/v1/titles/{titles[0]["id"]}/', method='DELETE'),
+            )
+
+        responses = asyncio.run(run())
+        assert responses[0][0]['status'] == 200
+        assert json.loads(responses[0][1]['body'])['count'] == 2
+        assert responses[1][0]['status'] == 401, (
+            'Проверьте, что `api_yamdb.asgi` передаёт запросы вне каталога приложению Django'
+        )
+        assert b'detail' in b''.join(message.get('body', b'') for message in responses[1])
+        assert responses[2][0]['status'] == 401
@@ -0,0 +1,190 @@
+import pytest
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .common import auth_client
+
+
+class FailingBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class Test10Auth:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_send_code_queued(self, client, settings):
+        from api.mail import send_queued_mail
+        from api.models import Mails
+
+        settings.EMAIL_DELIVERY = 'queued'
+        for number in range(3):
+            response = client.post('/api/v1/auth/email/', data={'email': f'user{number}@yamdb.fake'})
+            assert response.status_code == 200, (
+                'Проверьте, что при POST запросе `/api/v1/auth/email/` возвращается статус 200'
+            )
+        assert len(mail.outbox) == 0 and Mails.objects.count() == 3, (
+            'Проверьте, что в режиме `queued` письмо ставится в очередь, а не отправляется сразу'
+        )
+
+        settings.EMAIL_BACKEND = 'tests.test_10_auth.FailingBackend'
+        assert send_queued_mail(batch_size=2) == (0, 2)
+        failed = Mails.objects.filter(attempts=1)
+        assert failed.count() == 2 and all(item.last_error for item in failed), (
+            'Проверьте, что письма с ошибкой отправки остаются в очереди для повтора'
+        )
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        assert send_queued_mail() == (1, 0), 'Повторная отправка ждёт своего времени'
+        failed.update(next_attempt=Mails.objects.earliest('created').created)
+        assert send_queued_mail() == (2, 0)
+        assert Mails.objects.count() == 0
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            'user0@yamdb.fake', 'user1@yamdb.fake', 'user2@yamdb.fake'
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_authenticated_user_cached(self, user_client, django_user_model,
+                                          django_assert_num_queries):
+        user = django_user_model.objects.create_user(
+            email='cached@yamdb.fake', username='cached', role='user'
+        )
+        client = auth_client(user)
+        with django_assert_num_queries(1):
+            response = client.get('/api/v1/users/me/')
+        assert response.json()['role'] == 'user'
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/users/me/')
+        assert response.json()['username'] == 'cached', (
+            'Проверьте, что повторный запрос берёт пользователя из кэша'
+        )
+
+        response = user_client.patch('/api/v1/users/cached/', data={'role': 'moderator'})
+        assert response.status_code == 200
+        response = client.get('/api/v1/users/me/')
+        assert response.json()['role'] == 'moderator', (
+            'Проверьте, что изменение пользователя сбрасывает его запись в кэше'
+        )
+
+        user.delete()
+        response = client.get('/api/v1/users/me/')
+        assert response.status_code == 401, (
+            'Проверьте, что удалённый пользователь не остаётся в кэше'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_claims_tokens(self, admin, django_user_model, settings,
+                              django_assert_num_queries):
+        from datetime import timedelta
+
+        from rest_framework.test import APIClient
+
+        from api.authentication import issue_token
+
+        settings.AUTH_CLAIMS_TOKENS = True
+        admin_client = APIClient()
+        admin_client.credentials(HTTP_AUTHORIZATION=f'Bearer {issue_token(admin)}')
+        # COUNT for pagination and the page of users, no query for the admin
+        with django_assert_num_queries(2):
+            response = admin_client.get('/api/v1/users/')
+        assert response.status_code == 200, (
+            'Проверьте, что токен с ролью авторизует безопасные запросы без обращения к базе'
+        )
+        response = admin_client.get('/api/v1/users/me/')
+        assert response.json()['email'] == admin.email
+
+        reader = django_user_model.objects.create_user(
+            email='reader@yamdb.fake', username='reader', role='user'
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {issue_token(reader)}')
+        assert client.get('/api/v1/users/').status_code == 403
+
+        reader.role = 'admin'
+        reader.is_staff = True
+        reader.save()
+        assert client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что после изменения пользователя роль из токена больше не используется'
+        )
+
+        reader.role = 'user'
+        reader.is_staff = False
+        reader.save()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {issue_token(reader)}')
+        settings.AUTH_CLAIMS_LIFETIME = timedelta(0)
+        with django_assert_num_queries(1):
+            assert client.get('/api/v1/users/').status_code == 403
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_parallel_first_logins(self, django_user_model):
+        from collections import defaultdict
+        from concurrent.futures import ThreadPoolExecutor
+        from unittest import mock
+
+        from django.test import Client
+        from rest_framework.throttling import SimpleRateThrottle
+
+        from api.views import SendConfirmCodeView
+
+        emails = [f'parallel{number}@yamdb.fake' for number in range(4)]
+        codes = {email: SendConfirmCodeView().create_jwt(email) for email in emails}
+
+        def login(email):
+            response = Client().post('/api/v1/auth/token/', data={
+                'email': email, 'confirmation_code': codes[email]
+            })
+            return response.status_code, int(response['X-Query-Count'])
+
+        no_limits = defaultdict(lambda: None)
+        with mock.patch.object(SimpleRateThrottle, 'THROTTLE_RATES', no_limits), \
+                ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(login, emails * 8))
+
+        statuses = {status for status, _ in results}
+        assert statuses == {200}, (
+            'Проверьте, что одновременные первые входы с одной почтой не приводят к ошибке'
+        )
+        assert django_user_model.objects.filter(email__in=emails).count() == 4
+        queries = [queries for _, queries in results]
+        # SELECT for a known user; SELECT, BEGIN, INSERT and SELECT at worst
+        assert max(queries) <= 4 and sum(queries) / len(queries) < 2, (
+            'Проверьте, что выдача токена обходится меньшим числом запросов к базе'
+        )
+
+        with mock.patch.object(SimpleRateThrottle, 'THROTTLE_RATES', no_limits):
+            assert login(emails[0]) == (200, 1), (
+                'Проверьте, что токен для существующего пользователя выдаётся за один запрос к базе'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_queued_mail_claimed_once(self, client, settings):
+        from api.mail import claim_mails, send_queued_mail
+
+        settings.EMAIL_DELIVERY = 'queued'
+        for number in range(3):
+            client.post('/api/v1/auth/email/', data={'email': f'user{number}@yamdb.fake'})
+
+        assert len(claim_mails(batch_size=2, max_attempts=5)) == 2
+        assert send_queued_mail() == (1, 0), (
+            'Проверьте, что письма, взятые другим обработчиком, не отправляются повторно'
+        )
+        assert send_queued_mail() == (0, 0)
+        assert [message.to[0] for message in mail.outbox] == ['user2@yamdb.fake']
+
+    def test_06_claims_tokens_need_shared_cache(self, settings):
+        from unittest import mock
+
+        from django.core.exceptions import ImproperlyConfigured
+
+        from api.authentication import check_claims_cache
+
+        settings.AUTH_CLAIMS_TOKENS = True
+        check_claims_cache()
+        for backend in ('locmem.LocMemCache', 'dummy.DummyCache'):
+            with mock.patch.dict(settings.CACHES['default'], BACKEND=f'django.core.cache.backends.{backend}'):
+                with pytest.raises(ImproperlyConfigured):
+                    check_claims_cache()
+        settings.AUTH_CLAIMS_TOKENS = False
+        with mock.patch.dict(settings.CACHES['default'], BACKEND='django.core.cache.backends.locmem.LocMemCache'):
+            check_claims_cache()
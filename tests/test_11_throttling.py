@@ -0,0 +1,115 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from unittest import mock
+
+import pytest
+from rest_framework.throttling import SimpleRateThrottle
+
+from .common import auth_client
+
+
+def hit_counter(path, times, returning=True):
+    from api.throttling import SQLiteThrottleStorage
+
+    storage = SQLiteThrottleStorage(path)
+    storage.returning = returning
+    return [storage.incr('key', 1, 60) for _ in range(times)]
+
+
+class Test11Throttling:
+
+    @pytest.mark.parametrize('returning', [True, False])
+    def test_01_counters_shared_between_processes(self, tmp_path, returning):
+        path = str(tmp_path / 'throttle.sqlite3')
+        with ProcessPoolExecutor(4, mp_context=get_context('fork')) as pool:
+            results = list(pool.map(hit_counter, [path] * 4, [50] * 4, [returning] * 4))
+
+        hits = sorted(hit for result in results for hit in result)
+        assert hits == list(range(1, 201)), (
+            'Проверьте, что счётчики запросов общие для всех процессов '
+            'и ни одно увеличение не теряется'
+        )
+        assert hit_counter(path, 1) == [201]
+
+    def test_02_counter_resets_in_new_window(self, tmp_path):
+        from api.throttling import SQLiteThrottleStorage
+
+        storage = SQLiteThrottleStorage(str(tmp_path / 'throttle.sqlite3'))
+        assert [storage.incr('key', 1, 60) for _ in range(3)] == [1, 2, 3]
+        assert storage.incr('key', 2, 120) == 1
+        assert storage.incr('other', 2, 120) == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_non_employee_throttled(self, client, admin):
+        rates = {'burst-non-employee': '3/min'}
+        with mock.patch.object(SimpleRateThrottle, 'THROTTLE_RATES', rates):
+            statuses = [client.get('/api/v1/genres/').status_code
+                        for _ in range(4)]
+            assert statuses == [200, 200, 200, 429], (
+                'Проверьте, что запросы сверх лимита получают статус 429'
+            )
+            response = client.get('/api/v1/genres/')
+            assert 0 < int(response['Retry-After']) <= 60
+
+            admin_client = auth_client(admin)
+            assert all(
+                admin_client.get('/api/v1/genres/').status_code == 200
+                for _ in range(4)
+            ), 'Проверьте, что на администраторов лимит не действует'
+
+    @pytest.mark.parametrize('returning', [True, False])
+    def test_04_gcra_burst_and_sustained_rate(self, tmp_path, returning):
+        from api.throttling import SQLiteThrottleStorage
+
+        storage = SQLiteThrottleStorage(str(tmp_path / 'throttle.sqlite3'))
+        # SQLite before 3.35 has no RETURNING.
+        storage.returning = returning
+        # 1 request in 10 seconds, up to 3 at once.
+        acquire = lambda now: storage.acquire('key', now, 10, 20)[0]  # noqa: E731
+        assert [acquire(1000) for _ in range(4)] == [True, True, True, False], (
+            'Проверьте, что сразу разрешается не больше `burst` запросов'
+        )
+        assert acquire(1005) is False
+        assert acquire(1010) is True
+        assert acquire(1011) is False
+        assert [acquire(1100) for _ in range(4)] == [True, True, True, False], (
+            'Проверьте, что после паузы запас запросов восстанавливается'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_burst_rate_throttle(self, client):
+        from api.throttling import NonEmployeeBurstRateThrottle
+
+        rates = {'burst-non-employee': {'sustained': '1/hour', 'burst': 2}}
+        with mock.patch.object(SimpleRateThrottle, 'THROTTLE_RATES', rates), \
+                mock.patch('api.views.GenresViewSet.throttle_classes', [NonEmployeeBurstRateThrottle]):
+            statuses = [client.get('/api/v1/genres/').status_code
+                        for _ in range(3)]
+            assert statuses == [200, 200, 429], (
+                'Проверьте, что ограничение учитывает размер пачки запросов'
+            )
+            response = client.get('/api/v1/genres/')
+            assert 3500 < int(response['Retry-After']) <= 3600
+
+    def test_06_throttle_benchmark(self):
+        from api.benchmarks.throttling import run_throttle_benchmark
+
+        report = run_throttle_benchmark(requests=50, keys=2, rate='10/min')
+        assert set(report['throttles']) == {'cache-history', 'fixed-window', 'gcra'}
+        for result in report['throttles'].values():
+            assert result['allowed'] == 20
+            assert result['us_per_request'] > 0
+        sizes = {name: result['state_bytes_per_key'] for name, result in report['throttles'].items()}
+        assert 0 < sizes['gcra'] < sizes['cache-history'], (
+            'Проверьте, что размер состояния измеряется по данным хранилища'
+        )
+        assert 0 < sizes['fixed-window'] < sizes['cache-history']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_dict_rate_needs_burst_throttle(self, client):
+        from django.core.exceptions import ImproperlyConfigured
+
+        rates = {'burst-non-employee': {'sustained': '1/hour', 'burst': 2}}
+        with mock.patch.object(SimpleRateThrottle, 'THROTTLE_RATES', rates):
+            with pytest.raises(ImproperlyConfigured):
+                client.get('/api/v1/genres/')
@@ -0,0 +1,60 @@
+import datetime as dt
+import io
+from collections import OrderedDict
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from .common import create_reviews
+
+
+class Test12Renderers:
+
+    @pytest.mark.parametrize('data', (
+        OrderedDict((('id', 1), ('name', 'Крёстный отец'), ('rating', 7.25), ('genre', []))),
+        {'pub_date': dt.datetime(2021, 7, 1, 12, 30, tzinfo=dt.timezone.utc), 'day': dt.date(2021, 7, 1)},
+        {'text': 'строка и абзац "в кавычках" \\ \n', 'score': Decimal('9.5')},
+        {'detail': [ErrorDetail('Ошибка', code='invalid'), gettext_lazy('This field is required.')]},
+        [None, True, False, 0, -1, 2 ** 70, 0.1],
+    ))
+    def test_01_same_output_as_json_renderer(self, data):
+        from api.renderers import FastJSONRenderer
+
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data), (
+            'Проверьте, что FastJSONRenderer возвращает те же байты, что и JSONRenderer'
+        )
+        media_type = 'application/json; indent=4'
+        assert FastJSONRenderer().render(data, media_type) == JSONRenderer().render(data, media_type)
+
+    @pytest.mark.parametrize('content', (
+        '{"name": "Крёстный отец", "genre": ["drama"], "year": 1972}',
+        '[1, 2.5, null, true, 123456789012345678901234567890]',
+    ))
+    def test_02_same_data_as_json_parser(self, content):
+        from api.parsers import FastJSONParser
+
+        content = content.encode()
+        assert FastJSONParser().parse(io.BytesIO(content)) == JSONParser().parse(io.BytesIO(content))
+
+    @pytest.mark.parametrize('content', (b'{"name": ', b'[NaN]'))
+    def test_03_same_errors_as_json_parser(self, content):
+        from api.parsers import FastJSONParser
+
+        with pytest.raises(ParseError) as expected:
+            JSONParser().parse(io.BytesIO(content))
+        with pytest.raises(ParseError) as error:
+            FastJSONParser().parse(io.BytesIO(content))
+        assert str(error.value) == str(expected.value)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_api_responses(self, client, user_client, admin):
+        _, titles, _, _ = create_reviews(user_client, admin)
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{titles[0]["id"]}/reviews/'):
+            response = client.get(url)
+            assert JSONRenderer().render(response.json()) == response.content, (
+                'Проверьте, что ответы API не изменились'
+            )
@@ -0,0 +1,31 @@
+import pytest
+from rest_framework import viewsets
+from rest_framework.routers import SimpleRouter
+
+
+class Test13QueryPlans:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_viewsets_use_indexes(self):
+        from api.query_plans import find_full_scans
+
+        scans = find_full_scans()
+        assert not scans, (
+            'Проверьте, что запросы viewset с фильтрами используют индексы: '
+            + '; '.join(f'{scan.view}.{scan.action} {scan.params} читает {scan.table}' for scan in scans)
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_full_scan_is_reported(self):
+        from api.models import Titles
+        from api.query_plans import find_full_scans
+
+        class DescriptionViewSet(viewsets.ReadOnlyModelViewSet):
+            queryset = Titles.objects.filter(description='Описание')
+
+        router = SimpleRouter()
+        router.register('descriptions', DescriptionViewSet, basename='descriptions')
+        scans = find_full_scans(router)
+        assert [(scan.action, scan.table) for scan in scans] == [('list', 'api_titles')], (
+            'Проверьте, что проверка планов сообщает о полном чтении таблицы при фильтре без индекса'
+        )
@@ -0,0 +1,30 @@
+import pytest
+
+
+class Test14SQLite:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_pragmas_applied_on_connect(self):
+        from django.db import connection
+
+        connection.close()
+        with connection.cursor() as cursor:
+            pragmas = {}
+            for name in ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'busy_timeout'):
+                cursor.execute(f'PRAGMA {name}')
+                pragmas[name] = cursor.fetchone()[0]
+        assert pragmas['journal_mode'] == 'wal', 'Проверьте, что база данных работает в режиме WAL'
+        # NORMAL
+        assert pragmas['synchronous'] == 1, 'Проверьте, что для SQLite задан synchronous=NORMAL'
+        assert pragmas['mmap_size'] == 256 * 1024 * 1024
+        assert pragmas['cache_size'] == -64 * 1024
+        assert pragmas['busy_timeout'] == 5000
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_pragmas_not_counted_as_queries(self, client, django_assert_num_queries):
+        from django.db import connection
+
+        connection.close()
+        with django_assert_num_queries(1):
+            response = client.get('/api/v1/categories/')
+        assert response.status_code == 200
@@ -0,0 +1,85 @@
+import pytest
+
+from .common import auth_client, create_genre, create_titles
+
+
+class Test15Replicas:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_router(self, replica):
+        from api.models import Titles
+        from api.replicas import ReplicaRouter, RoutingState, current_routing
+
+        router = ReplicaRouter()
+        assert router.db_for_read(Titles) == 'default', (
+            'Проверьте, что вне запроса чтение идёт из основной базы'
+        )
+        token = current_routing.set(RoutingState(pinned=False))
+        try:
+            assert router.db_for_read(Titles) == replica, (
+                'Проверьте, что GET-запросы читают из реплики'
+            )
+            assert router.db_for_write(Titles) == 'default'
+            assert router.db_for_read(Titles) == 'default', (
+                'Проверьте, что после записи запрос читает из основной базы'
+            )
+        finally:
+            current_routing.reset(token)
+        assert not router.allow_migrate(replica, 'api')
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_requests_read_from_replica(self, client, user_client, replica):
+        from api.replicas import PIN_COOKIE, sync_replicas
+
+        create_titles(user_client)
+        sync_replicas()
+        response = user_client.post('/api/v1/titles/', data={'name': 'Новое', 'year': 2001, 'description': 'Ещё'})
+        assert response.status_code == 201
+        assert PIN_COOKIE in response.cookies, (
+            'Проверьте, что после записи клиент получает cookie, закрепляющую его за основной базой'
+        )
+
+        assert client.get('/api/v1/titles/').json()['count'] == 2, (
+            'Проверьте, что GET-запросы без cookie читают из реплики'
+        )
+        assert user_client.get('/api/v1/titles/').json()['count'] == 3, (
+            'Проверьте, что клиент, который только что писал, читает из основной базы'
+        )
+
+        sync_replicas()
+        assert client.get('/api/v1/titles/').json()['count'] == 3, (
+            'Проверьте, что реплика видит данные после копирования'
+        )
+        response = client.get('/api/v1/titles/')
+        assert PIN_COOKIE not in response.cookies
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_shared_caches_filled_from_primary(self, client, user_client, django_user_model, replica):
+        from api.replicas import sync_replicas
+
+        create_genre(user_client)
+        sync_replicas()
+        user_client.post('/api/v1/genres/', data={'name': 'Мюзикл', 'slug': 'musical'})
+        response = client.get('/api/v1/genres/')
+        assert response.json()['count'] == 4, (
+            'Проверьте, что общий кэш списков заполняется из основной базы, а не из отстающей реплики'
+        )
+
+        user = django_user_model.objects.create_user(email='new@yamdb.fake', username='new', role='user')
+        response = auth_client(user).get('/api/v1/users/me/')
+        assert response.status_code == 200, (
+            'Проверьте, что пользователь для общего кэша читается из основной базы'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_user_pinned_without_cookie(self, client, user_client, replica):
+        from api.replicas import sync_replicas
+
+        create_titles(user_client)
+        sync_replicas()
+        user_client.post('/api/v1/titles/', data={'name': 'Новое', 'year': 2001, 'description': 'Ещё'})
+        user_client.cookies.clear()
+        assert user_client.get('/api/v1/titles/').json()['count'] == 3, (
+            'Проверьте, что пользователь, который только что писал, читает из основной базы и без cookie'
+        )
+        assert client.get('/api/v1/titles/').json()['count'] == 2
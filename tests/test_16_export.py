@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import auth_client, create_comments
+
+
+def read_stream(response):
+    assert response.streaming, 'Проверьте, что выгрузка отдаётся через `StreamingHttpResponse`'
+    return b''.join(response.streaming_content)
+
+
+class Test16Export:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_export_titles_ndjson(self, client, user_client, admin, monkeypatch):
+        monkeypatch.setattr('api.export.CHUNK_SIZE', 1)
+        _, _, titles, _, _ = create_comments(user_client, admin)
+
+        response = user_client.get('/api/v1/export/titles.ndjson')
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = read_stream(response).splitlines()
+        assert lines == [
+            client.get(f'/api/v1/titles/{title["id"]}/').content for title in titles
+        ], 'Проверьте, что каждая строка выгрузки совпадает с представлением произведения в API'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_export_reviews_and_comments_csv(self, user_client, admin):
+        comments, reviews, titles, _, _ = create_comments(user_client, admin)
+
+        response = user_client.get('/api/v1/export/reviews.csv')
+        assert response.status_code == 200
+        assert response['Content-Disposition'] == 'attachment; filename="reviews.csv"'
+        rows = list(csv.DictReader(io.StringIO(read_stream(response).decode())))
+        assert [(int(row['id']), int(row['title_id']), row['author'], int(row['score'])) for row in rows] == [
+            (review['id'], titles[0]['id'], review['author'], review['score']) for review in reviews
+        ], 'Проверьте, что выгрузка отзывов содержит произведение, автора и оценку'
+
+        response = user_client.get('/api/v1/export/comments.csv')
+        rows = list(csv.DictReader(io.StringIO(read_stream(response).decode())))
+        assert [(int(row['id']), int(row['review_id']), row['text']) for row in rows] == [
+            (comment['id'], reviews[0]['id'], comment['text']) for comment in comments
+        ]
+
+        response = user_client.get('/api/v1/export/titles.csv')
+        rows = list(csv.DictReader(io.StringIO(read_stream(response).decode())))
+        assert [(row['genre'], row['category'], row['rating']) for row in rows] == [
+            ('horror,comedy', 'films', '4.0'), ('drama', 'books', ''),
+        ], 'Проверьте, что жанры и категория записываются в CSV по slug'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_export_permissions(self, client, user_client, admin):
+        _, _, _, user, _ = create_comments(user_client, admin)
+
+        assert client.get('/api/v1/export/titles.csv').status_code == 401
+        response = auth_client(user).get('/api/v1/export/titles.csv', HTTP_ACCEPT='text/csv')
+        assert response.status_code == 403, 'Проверьте, что выгрузка доступна только администратору'
+        assert 'detail' in response.json()
+        assert user_client.get('/api/v1/export/users.csv').status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_export_command(self, user_client, admin, tmp_path):
+        create_comments(user_client, admin)
+        path = tmp_path / 'reviews.ndjson'
+
+        call_command('export_catalog', 'reviews', '--chunk-size', '2', '--output', str(path))
+        response = user_client.get('/api/v1/export/reviews.ndjson')
+        assert path.read_bytes() == read_stream(response), (
+            'Проверьте, что команда export_catalog выгружает то же, что и эндпоинт'
+        )
+
+        stdout = io.StringIO()
+        call_command('export_catalog', 'comments', stdout=stdout)
+        assert [json.loads(line)['text'] for line in stdout.getvalue().splitlines()] == [
+            'qwerty', 'qwerty123', 'qwerty321'
+        ]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_export_request_metrics(self, user_client, admin, caplog):
+        create_comments(user_client, admin)
+
+        with caplog.at_level('INFO', logger='api.metrics'), CaptureQueriesContext(connection) as queries:
+            caplog.clear()
+            response = user_client.get('/api/v1/export/reviews.csv')
+            assert not caplog.records, 'Проверьте, что выгрузка логируется после отправки содержимого'
+            read_stream(response)
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['path'] == '/api/v1/export/reviews.csv'
+        assert record['queries'] == len(queries) > 0, (
+            'Проверьте, что запросы, выполненные во время отправки выгрузки, учитываются в метриках'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_export_csv_dates(self, user_client, admin):
+        import datetime as dt
+
+        from rest_framework import serializers
+
+        from api.export import to_csv_value
+
+        comments, reviews, titles, _, _ = create_comments(user_client, admin)
+        response = user_client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/comments/')
+        api_dates = {comment['id']: comment['pub_date'] for comment in response.json()['results']}
+        response = user_client.get('/api/v1/export/comments.csv')
+        rows = list(csv.DictReader(io.StringIO(read_stream(response).decode())))
+        assert {int(row['id']): row['pub_date'] for row in rows} == api_dates, (
+            'Проверьте, что даты в CSV записываются в том же формате, что и в API'
+        )
+
+        value = dt.datetime(2021, 1, 1, tzinfo=dt.timezone.utc)
+        assert to_csv_value(value) == serializers.DateTimeField().to_representation(value)
+        assert to_csv_value(dt.date(2021, 1, 1)) == '2021-01-01'